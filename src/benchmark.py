@@ -0,0 +1,267 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+import io
+import re
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+import contextlib
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.simulate_and_recover import (forward_ez, inverse_ez, simulate_observed_stats, simulate_and_recover,
+                                      simulate_observed_stats_batch, simulate_and_recover_batch)
+from src.simulation_main import run_simulation
+
+# Default benchmark grid
+BATCH_SIZES = [1000, 100000, 1000000]
+N_VALUES = [10, 40, 4000, 100000]
+
+# Number of calls timed for the scalar (one triple per call) functions
+SCALAR_CALLS = 1000
+
+# Number of timed runs per case
+REPEATS = 7
+
+# Directory (git-ignored) holding the baseline of each machine; timings are
+# only comparable on the machine that recorded them
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.benchmarks')
+
+def baseline_path(machine=None):
+    """
+    Return the default baseline file of a machine (this one by default).
+    """
+    machine = machine or platform.node() or 'default'
+    return os.path.join(BASELINE_DIR, f"baseline_{re.sub(r'[^A-Za-z0-9_.-]', '_', machine)}.json")
+
+def measure(func, repeats=REPEATS):
+    """
+    Time a function and measure its peak traced memory.
+    
+    The function is timed repeats times without tracing (keeping the median
+    time, which is less sensitive to a noisy run than the best or the mean),
+    then run once more under tracemalloc to get its peak allocation.
+    
+    Parameters:
+    func (callable): Function taking no arguments
+    repeats (int): Number of timed runs
+    
+    Returns:
+    tuple: (seconds, peak_memory_bytes) - median wall time and peak traced memory
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    return float(np.median(times)), peak
+
+def _record(stage, triples, func, repeats, batch_size=None, N=None):
+    """
+    Measure one benchmark case and return its record.
+    """
+    seconds, peak = measure(func, repeats)
+    return {
+        'stage': stage,
+        'batch_size': batch_size,
+        'N': N,
+        'triples': triples,
+        'seconds': seconds,
+        'triples_per_second': triples / seconds if seconds > 0 else float('inf'),
+        'peak_memory_bytes': peak
+    }
+
+def run_benchmarks(batch_sizes=BATCH_SIZES, N_values=N_VALUES, sweep_iterations=100000,
+                   scalar_calls=SCALAR_CALLS, repeats=REPEATS, seed=0):
+    """
+    Benchmark the simulate-and-recover hot paths.
+    
+    Covers forward_ez and inverse_ez on batches, the batched sampler and
+    simulate_and_recover_batch for every (batch size, N) pair, the scalar
+    simulate_observed_stats and simulate_and_recover per call, and a
+    streaming run_simulation sweep over N_values.
+    
+    Parameters:
+    batch_sizes (list): Numbers of parameter triples per batch
+    N_values (list): Sample sizes
+    sweep_iterations (int): Iterations per N in the run_simulation sweep
+    scalar_calls (int): Number of calls timed for the scalar functions
+    repeats (int): Number of timed runs per case
+    seed (int): Random seed for the benchmark inputs
+    
+    Returns:
+    dict: Report with 'metadata' and a list of 'records'
+    """
+    rng = np.random.default_rng(seed)
+    records = []
+    
+    for size in batch_sizes:
+        v = rng.uniform(0.5, 2.0, size)
+        alpha = rng.uniform(0.5, 2.0, size)
+        tau = rng.uniform(0.1, 0.5, size)
+        R_pred, M_pred, V_pred = forward_ez(v, alpha, tau)
+        
+        records.append(_record('forward_ez', size, lambda: forward_ez(v, alpha, tau), repeats, size))
+        records.append(_record('inverse_ez', size, lambda: inverse_ez(R_pred, M_pred, V_pred), repeats, size))
+        
+        for N in N_values:
+            records.append(_record(
+                'simulate_observed_stats_batch', size,
+                lambda: simulate_observed_stats_batch(R_pred, M_pred, V_pred, N, rng), repeats, size, N))
+            records.append(_record(
+                'simulate_and_recover_batch', size,
+                lambda: simulate_and_recover_batch(v, alpha, tau, N, rng), repeats, size, N))
+    
+    for N in N_values:
+        def scalar_sampler():
+            for _ in range(scalar_calls):
+                simulate_observed_stats(0.75, 0.7, 0.05, N)
+        
+        def scalar_recover():
+            for _ in range(scalar_calls):
+                simulate_and_recover(1.0, 1.0, 0.3, N)
+        
+        records.append(_record('simulate_observed_stats', scalar_calls, scalar_sampler, repeats, N=N))
+        records.append(_record('simulate_and_recover', scalar_calls, scalar_recover, repeats, N=N))
+    
+    def sweep():
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_simulation(iterations=sweep_iterations, N_values=N_values, seed=seed, keep_rows=False)
+    
+    records.append(_record('run_simulation', sweep_iterations * len(N_values), sweep, repeats,
+                           batch_size=sweep_iterations))
+    
+    return {'metadata': _metadata(), 'records': records}
+
+def _metadata():
+    """
+    Describe the machine and library versions a report was produced on.
+    """
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count()
+    }
+
+def _case_key(record):
+    return (record['stage'], record['batch_size'], record['N'])
+
+def compare_to_baseline(report, baseline, tolerance=0.3):
+    """
+    Find benchmark cases whose throughput regressed against a baseline.
+    
+    Parameters:
+    report (dict): Report from run_benchmarks
+    baseline (dict): Earlier report to compare against
+    tolerance (float): Allowed relative drop in throughput before a case counts as a regression
+    
+    Returns:
+    list: One dict per regressed case with the baseline and current throughput
+    """
+    reference = {_case_key(record): record for record in baseline['records']}
+    regressions = []
+    
+    for record in report['records']:
+        old = reference.get(_case_key(record))
+        if old is None:
+            continue
+        
+        ratio = record['triples_per_second'] / old['triples_per_second']
+        if ratio < 1 - tolerance:
+            regressions.append({
+                'stage': record['stage'],
+                'batch_size': record['batch_size'],
+                'N': record['N'],
+                'baseline_triples_per_second': old['triples_per_second'],
+                'triples_per_second': record['triples_per_second'],
+                'ratio': ratio
+            })
+    
+    return regressions
+
+def format_report(report):
+    """
+    Format a benchmark report as a text table.
+    """
+    lines = [f"{'stage':<30} {'batch':>9} {'N':>7} {'seconds':>10} {'triples/s':>12} {'peak MB':>9}"]
+    for record in report['records']:
+        batch = '' if record['batch_size'] is None else record['batch_size']
+        N = '' if record['N'] is None else record['N']
+        lines.append(f"{record['stage']:<30} {batch:>9} {N:>7} {record['seconds']:>10.5f} "
+                     f"{record['triples_per_second']:>12.4g} {record['peak_memory_bytes'] / 1e6:>9.2f}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    """
+    Run the benchmarks, write the JSON report and check for regressions.
+    
+    The baseline defaults to this machine's file in BASELINE_DIR; record it
+    with --save-baseline before the first comparison.
+    
+    Returns:
+    int: Exit status (1 if any case regressed against the baseline)
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the EZ simulate-and-recover hot paths.")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=BATCH_SIZES)
+    parser.add_argument('--N-values', type=int, nargs='+', default=N_VALUES)
+    parser.add_argument('--sweep-iterations', type=int, default=100000)
+    parser.add_argument('--scalar-calls', type=int, default=SCALAR_CALLS)
+    parser.add_argument('--repeats', type=int, default=REPEATS, help="Timed runs per case (the median is kept)")
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    parser.add_argument('--baseline', default=baseline_path(),
+                        help="Baseline report to compare against (default: this machine's baseline)")
+    parser.add_argument('--tolerance', type=float, default=0.3,
+                        help="Allowed relative throughput drop before a case counts as a regression")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    args = parser.parse_args(argv)
+    
+    report = run_benchmarks(args.batch_sizes, args.N_values, args.sweep_iterations,
+                            args.scalar_calls, args.repeats)
+    print(format_report(report))
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print(f"No baseline found at {args.baseline}; record one with --save-baseline")
+        return 0
+    
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    
+    regressions = compare_to_baseline(report, baseline, args.tolerance)
+    for case in regressions:
+        print(f"REGRESSION {case['stage']} (batch={case['batch_size']}, N={case['N']}): "
+              f"{case['triples_per_second']:.4g} triples/s vs baseline {case['baseline_triples_per_second']:.4g}")
+    if not regressions:
+        print("No regressions against the baseline")
+    
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.simulate_and_recover import forward_ez, inverse_ez, inverse_ez_jacobian, simulate_observed_stats_batch
+
+# Default number of (subject x replicate) cells resampled at once
+DEFAULT_CHUNK_SIZE = 2000000
+
+def bootstrap_ez(R_obs, M_obs, V_obs, N, n_boot=2000, ci=0.95, rng=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                 inverse=inverse_ez):
+    """
+    Parametric bootstrap confidence intervals for EZ estimates of many subjects.
+    
+    Each subject's observed statistics are fitted with inverse_ez, turned
+    back into predictions with forward_ez, resampled n_boot times from the
+    Eq. 7-9 distributions (simulate_observed_stats_batch) and re-fitted, all
+    as (subjects x replicates) array operations. Subjects are processed in
+    blocks of at most chunk_size cells to bound memory. The replicate
+    re-fits, which dominate the cost, use inverse; the point estimates always
+    come from inverse_ez.
+    
+    Parameters:
+    R_obs (array): Observed accuracy of each subject
+    M_obs (array): Observed mean RT of each subject
+    V_obs (array): Observed variance of RT of each subject
+    N (int or array): Number of trials of each subject
+    n_boot (int): Number of bootstrap replicates per subject
+    ci (float): Coverage of the percentile confidence intervals
+    rng (Generator, int or None): Random generator or seed
+    chunk_size (int): Maximum number of cells resampled at once
+    inverse (callable): Inverse for the replicate re-fits, inverse_ez or a
+    drop-in approximation such as an InverseLookupTable
+    
+    Returns:
+    dict: For each of 'v', 'alpha' and 'tau', the point estimates, plus
+    '<name>_ci' with (subjects, 2) lower/upper bounds and '<name>_se' with the
+    bootstrap standard deviations
+    """
+    rng = np.random.default_rng(rng)
+    R_obs, M_obs, V_obs, N = (np.atleast_1d(x) for x in np.broadcast_arrays(R_obs, M_obs, V_obs, N))
+    N = N.astype(np.int64)
+    n_subjects = len(R_obs)
+    
+    # Fit each subject, then predict the summary statistics the fit implies
+    estimates = [np.atleast_1d(x) for x in inverse_ez(R_obs, M_obs, V_obs)]
+    R_pred, M_pred, V_pred = forward_ez(*estimates)
+    
+    tail = (1 - ci) / 2 * 100
+    bounds = [np.empty((n_subjects, 2)) for _ in range(3)]
+    spreads = [np.empty(n_subjects) for _ in range(3)]
+    block = max(1, chunk_size // n_boot)
+    
+    for start in range(0, n_subjects, block):
+        subjects = slice(start, start + block)
+        
+        # Resample every replicate of the block at once and re-fit
+        shape = (len(R_obs[subjects]), n_boot)
+        R_boot, M_boot, V_boot = simulate_observed_stats_batch(
+            np.broadcast_to(R_pred[subjects, None], shape),
+            np.broadcast_to(M_pred[subjects, None], shape),
+            np.broadcast_to(V_pred[subjects, None], shape),
+            np.broadcast_to(N[subjects, None], shape), rng)
+        replicates = inverse(R_boot, M_boot, V_boot)
+        
+        for i, values in enumerate(replicates):
+            bounds[i][subjects] = np.percentile(values, [tail, 100 - tail], axis=1).T
+            spreads[i][subjects] = np.std(values, axis=1, ddof=1)
+    
+    results = {}
+    for i, name in enumerate(('v', 'alpha', 'tau')):
+        results[name] = estimates[i]
+        results[f'{name}_ci'] = bounds[i]
+        results[f'{name}_se'] = spreads[i]
+    
+    return results
+
+def delta_method_ez(R_obs, M_obs, V_obs, N, ci=0.95):
+    """
+    Delta-method standard errors and confidence intervals for EZ estimates.
+    
+    A closed-form alternative to bootstrap_ez: the sampling covariance of the
+    observed statistics under Eqs. 7-9 (Var R = R(1-R)/N, Var M = V/N,
+    Var V = 2V^2/(N-1), independent), evaluated at the observed values, is
+    propagated through the analytic Jacobian of inverse_ez. The cost is a
+    handful of array operations per subject, with no resampling.
+    
+    Parameters:
+    R_obs (array): Observed accuracy of each subject
+    M_obs (array): Observed mean RT of each subject
+    V_obs (array): Observed variance of RT of each subject
+    N (int or array): Number of trials of each subject (N <= 1 gives NaN errors)
+    ci (float): Coverage of the normal-approximation confidence intervals
+    
+    Returns:
+    dict: Same keys as bootstrap_ez - for each of 'v', 'alpha' and 'tau', the
+    point estimates, '<name>_ci' with (subjects, 2) bounds and '<name>_se'
+    """
+    # Imported here so that importing this module does not pull in scipy.stats
+    import scipy.stats as stats
+    
+    R_obs, M_obs, V_obs, N = (np.atleast_1d(np.asarray(x, dtype=float))
+                              for x in np.broadcast_arrays(R_obs, M_obs, V_obs, N))
+    
+    *estimates, jacobian = inverse_ez_jacobian(R_obs, M_obs, V_obs)
+    
+    # Variances of the observed statistics, at the same guarded values inverse_ez uses
+    R = np.clip(R_obs, 0.001, 0.999)
+    V = np.where(V_obs <= 0, 1e-10, V_obs)
+    variances = np.stack([R * (1 - R) / N, V / N,
+                          np.where(N > 1, 2 * V**2 / np.where(N > 1, N - 1, 1), np.nan)], axis=-1)
+    
+    # diag(J diag(variances) J^T) for every subject
+    errors = np.sqrt(np.einsum('...ij,...j,...ij->...i', jacobian, variances, jacobian))
+    z = stats.norm.ppf(0.5 + ci / 2)
+    
+    results = {}
+    for i, name in enumerate(('v', 'alpha', 'tau')):
+        results[name] = np.atleast_1d(estimates[i])
+        results[f'{name}_ci'] = np.stack([results[name] - z * errors[:, i], results[name] + z * errors[:, i]], axis=-1)
+        results[f'{name}_se'] = errors[:, i]
+    
+    return results
@@ -0,0 +1,90 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+import argparse
+
+# Only the standard library is imported at module level so that --help and
+# argument errors return without loading NumPy or the simulation code
+
+# Default output directory (the repository's results folder)
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'results')
+
+def _positive_int(text):
+    """
+    Parse a command-line integer that must be at least 1.
+    """
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+def build_parser():
+    """
+    Build the argument parser of the command-line entry point.
+    
+    Returns:
+    ArgumentParser: Parser for the run options
+    """
+    parser = argparse.ArgumentParser(
+        description="Simulate data from the EZ diffusion model and recover its parameters.")
+    parser.add_argument('--iterations', type=_positive_int, default=1000, help="Iterations for each N (default: 1000)")
+    parser.add_argument('--N-values', type=int, nargs='+', default=[10, 40, 4000],
+                        help="Sample sizes to simulate (default: 10 40 4000)")
+    parser.add_argument('--v-range', type=float, nargs=2, metavar=('LOW', 'HIGH'),
+                        help="Range of the true drift rate (default: 0.5 2.0)")
+    parser.add_argument('--alpha-range', type=float, nargs=2, metavar=('LOW', 'HIGH'),
+                        help="Range of the true boundary separation (default: 0.5 2.0)")
+    parser.add_argument('--tau-range', type=float, nargs=2, metavar=('LOW', 'HIGH'),
+                        help="Range of the true non-decision time (default: 0.1 0.5)")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument('--workers', type=_positive_int,
+                        help="Processes for the chunked engine (default: the original serial loop)")
+    parser.add_argument('--chunk-size', type=_positive_int,
+                        help="Iterations per chunk in the chunked engine (needs --workers or --compact)")
+    parser.add_argument('--compact', action='store_true', help="Use the float32 compact mode")
+    parser.add_argument('--format', choices=['txt', 'npy'], default='txt',
+                        help="Format of the per-iteration results files (default: txt)")
+    parser.add_argument('--output-dir', default=RESULTS_DIR, help="Directory to save results in")
+    parser.add_argument('--store', help="Also append the per-iteration results to this results store (sqlite file)")
+    return parser
+
+def main(argv=None):
+    """
+    Run the simulation with the options given on the command line and save the results.
+    
+    With no options this reproduces simulation_main.main().
+    
+    Returns:
+    int: Exit status
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    # The serial loop has no chunks, so a chunk size alone would be ignored
+    if args.chunk_size is not None and args.workers is None and not args.compact:
+        parser.error("--chunk-size only applies to the chunked engine; also give --workers or --compact")
+    
+    # Deferred until the arguments are known to be valid
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from src.simulation_main import run_simulation, save_results
+    
+    ranges = {name: tuple(bounds) for name, bounds in
+              [('v', args.v_range), ('alpha', args.alpha_range), ('tau', args.tau_range)] if bounds}
+    options = {'chunk_size': args.chunk_size} if args.chunk_size is not None else {}
+    
+    results = run_simulation(iterations=args.iterations, N_values=args.N_values, seed=args.seed,
+                             workers=args.workers, ranges=ranges, compact=args.compact, **options)
+    save_results(results, args.output_dir, format=args.format)
+    
+    if args.store:
+        from src.results_store import ResultsStore
+        with ResultsStore(args.store) as store:
+            run_id = store.append(results, description=' '.join(argv if argv is not None else sys.argv[1:]))
+        print(f"Results appended to {args.store} as run {run_id}")
+    
+    print(f"Results saved to {args.output_dir}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
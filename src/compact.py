@@ -0,0 +1,256 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import numpy as np
+from src.simulate_and_recover import forward_ez, simulate_observed_stats_batch
+from src.running_stats import RunningStats
+
+# Rows of the working array of CompactBatch (a and b are scratch space)
+_WORK_ROWS = ('v', 'alpha', 'tau', 'R', 'M', 'V', 'v_est', 'alpha_est', 'tau_est', 'a', 'b')
+
+class CompactBatch:
+    """
+    Preallocated single-precision buffers for the batched simulate-and-recover pipeline.
+    
+    Runs the same steps as simulate_and_recover_batch (draw parameters,
+    forward equations, Eq. 7-9 sampling, inverse equations, clipping) with
+    every intermediate written in place into arrays allocated once, so
+    repeated chunks allocate almost nothing (only the binomial counts, which
+    NumPy cannot write into an existing array). With the default float32
+    working precision a chunk needs about half the memory of the float64
+    pipeline.
+    
+    Results are views into the buffers and are overwritten by the next run.
+    The draws follow the same distributions as simulate_observed_stats_batch
+    but consume the random stream differently, so they are not the float64
+    results rounded.
+    """
+    
+    def __init__(self, size, dtype=np.float32):
+        """
+        Parameters:
+        size (int): Largest number of iterations run at once
+        dtype (dtype): Working precision
+        """
+        self.size = int(size)
+        self.dtype = np.dtype(dtype)
+        self.work = np.empty((len(_WORK_ROWS), self.size), self.dtype)
+        
+        # Rows: bias_v, bias_alpha, bias_tau, squared_error
+        self.errors = np.empty((4, self.size), self.dtype)
+    
+    def run(self, n, N, ranges, rng):
+        """
+        Simulate and recover n iterations with parameters drawn uniformly from ranges.
+        
+        Parameters:
+        n (int): Number of iterations (at most size)
+        N (int): Sample size
+        ranges (dict): (low, high) bounds for 'v', 'alpha' and 'tau'
+        rng (Generator): Random generator
+        
+        Returns:
+        tuple: (params, estimates, errors) - (3, n) views of the true parameters
+        and of the clipped estimates, and a (4, n) view of the biases and squared errors
+        """
+        if n > self.size:
+            raise ValueError(f"Batch of {n} iterations exceeds the buffer size {self.size}")
+        
+        v, alpha, tau, R, M, V, v_est, alpha_est, tau_est, a, b = self.work[:, :n]
+        
+        # Generate random parameters within the specified ranges
+        for x, name in ((v, 'v'), (alpha, 'alpha'), (tau, 'tau')):
+            low, high = ranges[name]
+            rng.random(dtype=self.dtype, out=x)
+            x *= high - low
+            x += low
+        
+        self._forward(v, alpha, tau, R, M, V, a)
+        self._sample(N, R, M, V, a, b, rng)
+        return self.recover(n)
+    
+    def recover(self, n):
+        """
+        Recover the parameters of the first n observed statistics in the buffers.
+        
+        Runs the inverse equations, clipping and error steps of run on the
+        true parameters in work rows v, alpha, tau and the observed statistics
+        in rows R, M, V (see compare_precision for filling them directly).
+        
+        Returns:
+        tuple: (params, estimates, errors), as for run
+        """
+        v, alpha, tau, R, M, V, v_est, alpha_est, tau_est, a, b = self.work[:, :n]
+        self._inverse(R, M, V, v_est, alpha_est, tau_est, a, b)
+        
+        # Apply the same constraints as simulate_and_recover
+        np.clip(v_est, 0.1, 5.0, out=v_est)
+        np.clip(alpha_est, 0.1, 5.0, out=alpha_est)
+        np.clip(tau_est, 0.01, 1.0, out=tau_est)
+        
+        # Calculate bias and squared error
+        errors = self.errors[:, :n]
+        np.subtract(self.work[0:3, :n], self.work[6:9, :n], out=errors[:3])
+        np.square(errors[0], out=errors[3])
+        for i in (1, 2):
+            np.square(errors[i], out=a)
+            errors[3] += a
+        
+        return self.work[0:3, :n], self.work[6:9, :n], errors
+    
+    @staticmethod
+    def _forward(v, alpha, tau, R, M, V, y):
+        """
+        Forward EZ equations (Eqs. 1-3), written into R, M and V.
+        """
+        np.copyto(v, 1e-10, where=v == 0)  # Avoid division by zero
+        
+        # y = exp(-alpha * v)
+        np.multiply(alpha, v, out=y)
+        np.negative(y, out=y)
+        np.exp(y, out=y)
+        
+        # Equation 1: R = 1 / (1 + y)
+        np.add(y, 1, out=R)
+        np.reciprocal(R, out=R)
+        
+        # Equation 2: M = tau + alpha / (2v) * (1 - y) / (1 + y), where (1 - y) / (1 + y) = 2R - 1
+        np.multiply(R, 2, out=M)
+        M -= 1
+        M *= alpha
+        M /= v
+        M *= 0.5
+        M += tau
+        
+        # Equation 3: V = alpha / (2v^3) * (1 - 2 alpha v y - y^2) / (1 + y)^2, where 1 / (1 + y)^2 = R^2
+        np.multiply(alpha, v, out=V)
+        V *= y
+        V *= -2
+        V += 1
+        np.square(y, out=y)
+        V -= y
+        V *= R
+        V *= R
+        V *= alpha
+        V /= v
+        V /= v
+        V /= v
+        V *= 0.5
+    
+    def _sample(self, N, R, M, V, a, b, rng):
+        """
+        Replace the predictions in R, M and V with observed statistics (Eqs. 7-9).
+        """
+        # Ensure parameters are valid
+        np.clip(R, 0.001, 0.999, out=R)
+        np.maximum(V, 1e-10, out=V)
+        
+        # Equation 7: Simulating observed number of correct trials
+        np.divide(rng.binomial(N, R), N, out=R)
+        
+        # Equation 8: Simulating observed mean RT
+        rng.standard_normal(dtype=self.dtype, out=a)
+        np.divide(V, N, out=b)
+        np.sqrt(b, out=b)
+        a *= b
+        M += a
+        
+        # Equation 9: Simulating observed variance of RT, with the same
+        # fallback as simulate_observed_stats for the degenerate N <= 1
+        if N > 1:
+            shape = (N - 1) / 2
+            rng.standard_gamma(shape, dtype=self.dtype, out=a)
+            a /= shape
+        else:
+            rng.random(dtype=self.dtype, out=a)
+            a += 0.5
+        V *= a
+        
+        # Ensure variance is positive
+        np.maximum(V, 1e-10, out=V)
+    
+    @staticmethod
+    def _inverse(R, M, V, v_est, alpha_est, tau_est, L, E):
+        """
+        Inverse EZ equations (Eqs. 4-6) with the guards of inverse_ez.
+        """
+        # Ensure parameters are valid
+        np.clip(R, 0.001, 0.999, out=R)
+        np.copyto(V, 1e-10, where=V <= 0)
+        
+        # L = log(R / (1 - R))
+        np.subtract(1, R, out=L)
+        np.divide(R, L, out=L)
+        np.log(L, out=L)
+        
+        # Expression under the 4th root, L * (R^2 L - R L + R - 0.5) / V, kept positive
+        np.subtract(R, 1, out=E)
+        E *= R
+        E *= L
+        E += R
+        E -= 0.5
+        E *= L
+        E /= V
+        np.copyto(E, 1e-10, where=E <= 0)
+        
+        # Equation 4: v = sign(R - 0.5) * E^(1/4); E >= 1e-10 keeps |v| away
+        # from zero except at R = 0.5, which gets the positive floor
+        np.sqrt(E, out=E)
+        np.sqrt(E, out=E)
+        np.subtract(R, 0.5, out=v_est)
+        np.sign(v_est, out=v_est)
+        v_est *= E
+        np.copyto(v_est, 1e-10, where=v_est == 0)
+        
+        # Equation 5: alpha = L / v
+        np.divide(L, v_est, out=alpha_est)
+        
+        # Equation 6: tau = M - alpha / (2v) * (1 - y) / (1 + y); since
+        # v * alpha = L, y = exp(-L) and (1 - y) / (1 + y) = 2R - 1
+        np.multiply(R, 2, out=E)
+        E -= 1
+        E *= alpha_est
+        E /= v_est
+        E *= 0.5
+        np.subtract(M, E, out=tau_est)
+        
+        # Sanity check for non-decision time (shouldn't be negative)
+        np.maximum(tau_est, 0.0, out=tau_est)
+
+def compare_precision(iterations, N, ranges, seed=None, chunk_size=200000):
+    """
+    Measure how much float32 recovery changes the compact-mode summaries.
+    
+    Draws iterations data sets in float64 (parameters from ranges, then
+    forward_ez and simulate_observed_stats_batch), recovers every chunk of
+    them with a float32 and a float64 CompactBatch, and compares the
+    summaries accumulated as run_simulation does. This is the comparison
+    behind the accuracy table in the README.
+    
+    Parameters:
+    iterations (int): Number of simulated data sets
+    N (int): Sample size
+    ranges (dict): (low, high) bounds for 'v', 'alpha' and 'tau'
+    seed (int): Random seed
+    chunk_size (int): Number of data sets recovered at once
+    
+    Returns:
+    tuple: (difference, standard_error) - absolute float32 minus float64
+    difference of the mean (bias_v, bias_alpha, bias_tau, squared_error), and
+    the float64 Monte Carlo standard errors of those means
+    """
+    rng = np.random.default_rng(seed)
+    batches = {dtype: CompactBatch(min(chunk_size, iterations), dtype) for dtype in (np.float32, np.float64)}
+    moments = {dtype: RunningStats(4) for dtype in batches}
+    
+    for start in range(0, iterations, chunk_size):
+        n = min(chunk_size, iterations - start)
+        params = [rng.uniform(*ranges[name], n) for name in ('v', 'alpha', 'tau')]
+        observed = simulate_observed_stats_batch(*forward_ez(*params), N, rng)
+        
+        for dtype, batch in batches.items():
+            batch.work[0:6, :n] = [*params, *observed]
+            _, _, errors = batch.recover(n)
+            moments[dtype].update(errors.T)
+    
+    difference = np.abs(moments[np.float32].mean - moments[np.float64].mean)
+    return difference, moments[np.float64].standard_error
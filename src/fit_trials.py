@@ -0,0 +1,246 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+import csv
+import argparse
+import itertools
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.simulate_and_recover import inverse_ez
+from src.running_stats import merge_moments
+
+# Values of the correct column that count as a correct response (besides nonzero numbers)
+TRUE_VALUES = ('1', 'true', 't', 'yes', 'y', 'correct')
+
+# Values of the RT column (lower case, stripped) that mark a missing response, like a blank cell
+MISSING_VALUES = ('', 'na', 'nan', 'n/a', 'null', 'none')
+
+class GroupMoments:
+    """
+    Online per-group accuracy and correct-RT moments.
+    
+    Groups are added as they are first seen; each chunk of trials is reduced
+    with np.bincount and merged into the running moments, so memory depends
+    on the number of groups, not on the number of trials.
+    """
+    
+    def __init__(self):
+        self.index = {}
+        self.n = np.zeros(0)
+        self.n_correct = np.zeros(0)
+        self.mean = np.zeros(0)
+        self.m2 = np.zeros(0)
+    
+    @property
+    def groups(self):
+        """
+        Group keys in order of first appearance.
+        """
+        return list(self.index)
+    
+    def update(self, keys, correct, rt):
+        """
+        Fold a chunk of trials into the per-group moments.
+        
+        Parameters:
+        keys (list): Group key of each trial (any hashable values)
+        correct (array): Whether each trial was correct
+        rt (array): Response time of each trial (non-finite values are skipped)
+        """
+        ids = np.fromiter((self.index.setdefault(key, len(self.index)) for key in keys),
+                          dtype=np.int64, count=len(keys))
+        self._grow(len(self.index))
+        
+        responded = np.isfinite(rt)
+        ids, correct, rt = ids[responded], np.asarray(correct, dtype=bool)[responded], rt[responded]
+        
+        size = len(self.index)
+        n = np.bincount(ids, minlength=size)
+        hit_ids, hit_rt = ids[correct], rt[correct]
+        n_correct = np.bincount(hit_ids, minlength=size).astype(float)
+        mean = np.bincount(hit_ids, weights=hit_rt, minlength=size) / np.maximum(n_correct, 1)
+        m2 = np.bincount(hit_ids, weights=(hit_rt - mean[hit_ids])**2, minlength=size)
+        
+        self.n += n
+        _, self.mean, self.m2 = merge_moments(self.n_correct, self.mean, self.m2, n_correct, mean, m2)
+        self.n_correct += n_correct
+    
+    def _grow(self, size):
+        extra = size - len(self.n)
+        if extra > 0:
+            self.n, self.n_correct, self.mean, self.m2 = (
+                np.concatenate([values, np.zeros(extra)]) for values in (self.n, self.n_correct, self.mean, self.m2))
+    
+    def summary_stats(self):
+        """
+        Return (R_obs, M_obs, V_obs, n) for every group, in order of first appearance.
+        """
+        R_obs = self.n_correct / np.maximum(self.n, 1)
+        M_obs = np.where(self.n_correct > 0, self.mean, np.nan)
+        V_obs = np.where(self.n_correct > 1, self.m2 / np.maximum(self.n_correct - 1, 1), np.nan)
+        return R_obs, M_obs, V_obs, self.n.copy()
+
+def read_trial_chunks(path, group_columns=('subject', 'condition'), correct_column='correct', rt_column='rt',
+                      chunk_rows=100000, delimiter=','):
+    """
+    Read a delimited trial file in chunks.
+    
+    Correct flags are parsed with _parse_correct; RTs that are blank or one
+    of MISSING_VALUES (e.g. 'NA') are returned as NaN. Blank lines are
+    skipped, and a row too short to hold the requested columns raises a
+    ValueError naming its line.
+    
+    Parameters:
+    path (str): CSV (or other delimited text) file with a header row
+    group_columns (tuple): Columns whose values identify a group
+    correct_column (str): Column holding the correct/incorrect flag
+    rt_column (str): Column holding the response time
+    chunk_rows (int): Number of rows per chunk
+    delimiter (str): Field delimiter
+    
+    Yields:
+    tuple: (keys, correct, rt) for each chunk - a list of group key tuples and two arrays
+    """
+    with open(path, newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = [name.strip() for name in next(reader)]
+        
+        missing = [name for name in (*group_columns, correct_column, rt_column) if name not in header]
+        if missing:
+            raise ValueError(f"Columns {missing} not found in {path}")
+        
+        group_positions = [header.index(name) for name in group_columns]
+        correct_position = header.index(correct_column)
+        rt_position = header.index(rt_column)
+        rows_iter = _data_rows(reader, path, max(*group_positions, correct_position, rt_position) + 1)
+        
+        while True:
+            rows = list(itertools.islice(rows_iter, chunk_rows))
+            if not rows:
+                break
+            
+            columns = list(zip(*rows))
+            keys = list(zip(*(columns[i] for i in group_positions)))
+            correct = _parse_correct(columns[correct_position])
+            rt = np.array([np.nan if value.strip().lower() in MISSING_VALUES else float(value)
+                           for value in columns[rt_position]])
+            
+            yield keys, correct, rt
+
+def _data_rows(reader, path, width):
+    """
+    Yield the data rows of a csv reader, skipping blank lines.
+    
+    Raises ValueError naming the line of any row with fewer than width fields.
+    """
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < width:
+            raise ValueError(f"Line {reader.line_num} of {path} has {len(row)} fields, expected at least {width}")
+        yield row
+
+def _parse_correct(values):
+    """
+    Parse a column of correct/incorrect flags into a boolean array.
+    
+    A flag is correct if it is one of TRUE_VALUES (ignoring case and
+    surrounding spaces) or a nonzero number, so '1.0' written by pandas for
+    a numeric column counts as correct. Each distinct value is parsed once.
+    """
+    distinct, inverse = np.unique(np.asarray(values), return_inverse=True)
+    parsed = np.array([_is_true(value) for value in distinct.tolist()], dtype=bool)
+    return parsed[inverse.ravel()]
+
+def _is_true(value):
+    value = value.strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    try:
+        number = float(value)
+    except ValueError:
+        return False
+    return not np.isnan(number) and number != 0
+
+def fit_trials_csv(path, group_columns=('subject', 'condition'), correct_column='correct', rt_column='rt',
+                   chunk_rows=100000, delimiter=','):
+    """
+    Fit the EZ diffusion model to every group of a trial-level file in one pass.
+    
+    The file is streamed in chunks; per-group accuracy and the mean and
+    sample variance of correct RTs are accumulated online, and inverse_ez is
+    then called once over all groups.
+    
+    Parameters:
+    path (str): CSV (or other delimited text) file with a header row
+    group_columns (tuple): Columns whose values identify a group
+    correct_column (str): Column holding the correct/incorrect flag
+    rt_column (str): Column holding the response time
+    chunk_rows (int): Number of rows read at a time
+    delimiter (str): Field delimiter
+    
+    Returns:
+    dict: 'groups' (list of key tuples) and arrays 'n', 'R_obs', 'M_obs', 'V_obs',
+    'v', 'alpha', 'tau' with one entry per group
+    """
+    moments = GroupMoments()
+    for keys, correct, rt in read_trial_chunks(path, group_columns, correct_column, rt_column,
+                                                chunk_rows, delimiter):
+        moments.update(keys, correct, rt)
+    
+    R_obs, M_obs, V_obs, n = moments.summary_stats()
+    v, alpha, tau = inverse_ez(R_obs, M_obs, V_obs)
+    
+    return {
+        'groups': moments.groups,
+        'group_columns': tuple(group_columns),
+        'n': n,
+        'R_obs': R_obs,
+        'M_obs': M_obs,
+        'V_obs': V_obs,
+        'v': np.atleast_1d(v),
+        'alpha': np.atleast_1d(alpha),
+        'tau': np.atleast_1d(tau)
+    }
+
+def save_fits(fits, output_file):
+    """
+    Write per-group fits to a CSV file.
+    
+    Parameters:
+    fits (dict): Output of fit_trials_csv
+    output_file (str): Path of the CSV file to write
+    """
+    values = ('n', 'R_obs', 'M_obs', 'V_obs', 'v', 'alpha', 'tau')
+    
+    with open(output_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([*fits['group_columns'], *values])
+        for i, key in enumerate(fits['groups']):
+            writer.writerow([*key, int(fits['n'][i]), *(f"{fits[name][i]:.6f}" for name in values[1:])])
+
+def main(argv=None):
+    """
+    Fit a trial-level CSV file from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Fit the EZ diffusion model to groups of trials in a CSV file.")
+    parser.add_argument('path', help="Trial-level CSV file")
+    parser.add_argument('--group', nargs='+', default=['subject', 'condition'], help="Grouping columns")
+    parser.add_argument('--correct-column', default='correct')
+    parser.add_argument('--rt-column', default='rt')
+    parser.add_argument('--chunk-rows', type=int, default=100000)
+    parser.add_argument('--delimiter', default=',')
+    parser.add_argument('--output', default='fits.csv', help="Output CSV file")
+    args = parser.parse_args(argv)
+    
+    fits = fit_trials_csv(args.path, args.group, args.correct_column, args.rt_column,
+                          args.chunk_rows, args.delimiter)
+    save_fits(fits, args.output)
+    print(f"Fitted {len(fits['groups'])} groups; results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
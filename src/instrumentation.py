@@ -0,0 +1,159 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import io
+import json
+import time
+import pstats
+import cProfile
+import contextlib
+from collections import defaultdict
+
+class _Stage:
+    """
+    Context manager adding its wall time to a stage.
+    """
+    
+    __slots__ = ('owner', 'name', 'start')
+    
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.owner.stage_seconds[self.name] += time.perf_counter() - self.start
+        self.owner.stage_calls[self.name] += 1
+        return False
+
+# Shared no-op context returned while instrumentation is disabled
+_DISABLED_STAGE = contextlib.nullcontext()
+
+class Instrumentation:
+    """
+    Per-stage wall time, throughput and guard-activation counters for the hot paths.
+    
+    While disabled (the default), stage() returns a shared no-op context and
+    count() returns immediately, and callers guard any extra work needed to
+    compute a count with `if instrumentation.enabled`, so the cost is a few
+    attribute lookups per call.
+    
+    Only the current process is recorded; stages run inside process-pool
+    workers are not included.
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.profile_text = None
+        self.reset()
+    
+    def reset(self):
+        """
+        Clear all recorded timings, counters and profiles.
+        """
+        self.stage_seconds = defaultdict(float)
+        self.stage_calls = defaultdict(int)
+        self.items = defaultdict(int)
+        self.counters = defaultdict(int)
+        self.profile_text = None
+    
+    def enable(self):
+        self.enabled = True
+    
+    def disable(self):
+        self.enabled = False
+    
+    def stage(self, name):
+        """
+        Return a context manager timing one pass through a stage.
+        
+        Parameters:
+        name (str): Stage name (e.g. 'forward', 'sampling', 'inverse', 'clipping', 'io')
+        """
+        if not self.enabled:
+            return _DISABLED_STAGE
+        return _Stage(self, name)
+    
+    def count(self, name, n=1):
+        """
+        Add n to a counter (e.g. a guard activation).
+        """
+        if self.enabled:
+            self.counters[name] += int(n)
+    
+    def add_items(self, name, n):
+        """
+        Record n items (e.g. iterations) processed by a stage, for its throughput.
+        """
+        if self.enabled:
+            self.items[name] += int(n)
+    
+    @contextlib.contextmanager
+    def profile(self, sort='cumulative', limit=30):
+        """
+        Run a block under cProfile and keep the formatted statistics in the report.
+        
+        Parameters:
+        sort (str): pstats sort key
+        limit (int): Number of functions listed
+        """
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats(sort).print_stats(limit)
+            self.profile_text = output.getvalue()
+    
+    def report(self):
+        """
+        Return the recorded data as a JSON-serializable dict.
+        
+        Returns:
+        dict: 'stages' (seconds, calls and, where items were recorded, items and
+        items_per_second), 'counters' and 'profile' (cProfile text or None)
+        """
+        stages = {}
+        for name, seconds in self.stage_seconds.items():
+            stages[name] = {'seconds': seconds, 'calls': self.stage_calls[name]}
+            if name in self.items:
+                stages[name]['items'] = self.items[name]
+                stages[name]['items_per_second'] = self.items[name] / seconds if seconds > 0 else None
+        
+        return {'stages': stages, 'counters': dict(self.counters), 'profile': self.profile_text}
+    
+    def save_report(self, path):
+        """
+        Write the report to a JSON file.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+# Process-wide instance used by the simulation code
+instrumentation = Instrumentation()
+
+@contextlib.contextmanager
+def instrumented(profile=False):
+    """
+    Enable a fresh instrumentation session for the duration of a block.
+    
+    Parameters:
+    profile (bool): Also run the block under cProfile
+    
+    Yields:
+    Instrumentation: The process-wide instance, whose report() holds the results
+    """
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        if profile:
+            with instrumentation.profile():
+                yield instrumentation
+        else:
+            yield instrumentation
+    finally:
+        instrumentation.disable()
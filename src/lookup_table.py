@@ -0,0 +1,275 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.simulate_and_recover import inverse_ez
+
+# Accuracy range covered by the table (inverse_ez clips R_obs to it)
+R_MIN, R_MAX = 0.001, 0.999
+
+# The same range as log-odds, the variable the table is laid out in
+L_MIN, L_MAX = np.log(R_MIN / (1 - R_MIN)), np.log(R_MAX / (1 - R_MAX))
+
+# Drift rates below this size are recovered with the exact inverse, where its guards apply
+EXACT_BELOW = 0.01
+
+# Points evaluated together, small enough for the work buffers to stay in cache
+BLOCK_SIZE = 16384
+
+# Default on-disk cache location
+CACHE_DIR = os.environ.get('EZ_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'ez-diffusion'))
+
+def _drift_coefficient(L):
+    """
+    Exact drift-rate coefficient a(L) of the inverse EZ equations.
+    
+    With L = logit(R), Eq. 4 separates into v = a(L) * V**(-1/4), where
+    a = sign(L) * g**(1/4) and g = L * (R^2 L - R L + R - 0.5) is the
+    numerator under the fourth root. a is smooth in L (about linear near
+    L = 0 and growing like sqrt(L) in the tails), so it interpolates well on
+    a uniform L grid.
+    
+    Returns:
+    array: a at each L
+    """
+    L = np.asarray(L, dtype=float)
+    u = np.tanh(L / 2)  # 2R - 1
+    
+    # R^2 L - R L + R - 0.5 = (u - (1 - u^2) artanh(u)) / 2 cancels badly near R = 0.5,
+    # so use its series sum_k u^(2k+1) / (4k^2 - 1) there
+    inner = (u - (1 - u**2) * L / 2) / 2
+    small = np.abs(u) < 0.1
+    series = sum(u**(2 * k + 1) / (4 * k**2 - 1) for k in range(1, 12))
+    inner = np.where(small, series, inner)
+    
+    return np.sign(L) * (L * inner)**(1/4)
+
+class InverseLookupTable:
+    """
+    Table-driven approximation of inverse_ez.
+    
+    Only the costly part of the inverse, the drift-rate coefficient a(L) of
+    Eq. 4 (see _drift_coefficient), is tabulated, on a uniform grid of log
+    odds over [L_MIN, L_MAX], and linearly interpolated. The rest is exact
+    and cheap: v = a / V**(1/4), alpha = L / v (Eq. 5) and, since
+    v * alpha = L, tau = M - alpha * (R - 0.5) / v (Eq. 6, no exp needed).
+    Points whose recovered drift rate is below EXACT_BELOW (around R = 0.5,
+    where the exact inverse applies its guards) or is not finite fall back to
+    inverse_ez.
+    """
+    
+    def __init__(self, values, max_error=None):
+        """
+        Parameters:
+        values (array): a on the grid
+        max_error (dict): Maximum absolute error against inverse_ez per output, if validated
+        """
+        self.values = np.ascontiguousarray(values, dtype=float)
+        self.size = len(self.values)
+        self.step = (L_MAX - L_MIN) / (self.size - 1)
+        self.max_error = max_error
+        
+        # Node values and slopes, for one gather each per lookup (the last
+        # node gets slope 0, so R = R_MAX needs no special index)
+        self._slopes = np.append(np.diff(self.values), 0.0)
+        self._inverse_step = 1 / self.step
+    
+    @classmethod
+    def build(cls, size):
+        """
+        Build a table with a given number of grid points.
+        
+        Parameters:
+        size (int): Number of grid points (rounded up to an even number so R = 0.5 is not a node)
+        """
+        size += size % 2
+        return cls(_drift_coefficient(np.linspace(L_MIN, L_MAX, size)))
+    
+    @classmethod
+    def build_to_tolerance(cls, tolerance=1e-6, start_size=256, max_size=2**20):
+        """
+        Build the smallest table (doubling the grid) whose validated error is within tolerance.
+        
+        Parameters:
+        tolerance (float): Maximum absolute error allowed for v, alpha and tau
+        start_size (int): Grid size of the first attempt
+        max_size (int): Largest grid size tried
+        
+        Returns:
+        InverseLookupTable: Validated table (the largest one if the tolerance is not met)
+        """
+        size = start_size
+        while True:
+            table = cls.build(size)
+            table.validate()
+            if max(table.max_error.values()) <= tolerance or size >= max_size:
+                return table
+            size *= 2
+    
+    def __call__(self, R_obs, M_obs, V_obs):
+        """
+        Approximate inverse_ez(R_obs, M_obs, V_obs).
+        
+        The inputs are processed in blocks of BLOCK_SIZE points with reused
+        work buffers, so the intermediates stay in cache and no full-size
+        temporaries are allocated.
+        
+        Parameters:
+        R_obs (array): Observed accuracy
+        M_obs (array): Observed mean RT
+        V_obs (array): Observed variance of RT
+        
+        Returns:
+        tuple: (v_est, alpha_est, tau_est) arrays
+        """
+        R_obs, M_obs, V_obs = np.broadcast_arrays(np.asarray(R_obs, dtype=float),
+                                                  np.asarray(M_obs, dtype=float),
+                                                  np.asarray(V_obs, dtype=float))
+        shape = R_obs.shape
+        R_obs, M_obs, V_obs = (np.ravel(x) for x in (R_obs, M_obs, V_obs))
+        
+        estimates = np.empty((3, len(R_obs)))
+        work = np.empty((3, min(BLOCK_SIZE, len(R_obs))))
+        index = np.empty(work.shape[1], dtype=np.intp)
+        
+        for start in range(0, len(R_obs), BLOCK_SIZE):
+            block = slice(start, start + BLOCK_SIZE)
+            self._evaluate(R_obs[block], M_obs[block], V_obs[block], estimates[:, block], work, index)
+        
+        # Scalar inputs give NumPy scalars, like inverse_ez
+        return tuple(x.reshape(shape)[()] for x in estimates)
+    
+    def _evaluate(self, R_obs, M_obs, V_obs, estimates, work, index):
+        """
+        Fill estimates with the (v, alpha, tau) of one block, using work and index as scratch space.
+        """
+        n = len(R_obs)
+        R, L, scratch = work[:, :n]
+        index = index[:n]
+        v_est, alpha_est, tau_est = estimates
+        
+        # L = log(R / (1 - R)) with inverse_ez's clipping
+        np.clip(R_obs, R_MIN, R_MAX, out=R)
+        np.subtract(1, R, out=L)
+        np.divide(R, L, out=L)
+        np.log(L, out=L)
+        
+        # Locate each L on the grid; the gathers clip the index, and a NaN R
+        # gets a NaN weight and is sent to the exact inverse below
+        weight = np.subtract(L, L_MIN, out=scratch)
+        weight *= self._inverse_step
+        with np.errstate(invalid='ignore'):
+            np.copyto(index, weight, casting='unsafe')
+        weight -= index
+        
+        # Equation 4: v = a / V^(1/4), with a interpolated and inverse_ez's floor on V
+        np.take(self._slopes, index, out=v_est, mode='clip')
+        v_est *= weight
+        v_est += np.take(self.values, index, out=scratch, mode='clip')
+        
+        fourth_root = scratch
+        np.copyto(fourth_root, V_obs)
+        np.copyto(fourth_root, 1e-10, where=fourth_root <= 0)
+        np.sqrt(fourth_root, out=fourth_root)
+        np.sqrt(fourth_root, out=fourth_root)
+        v_est /= fourth_root
+        
+        # Near R = 0.5 the exact inverse may clamp the fourth root, so those
+        # points (and non-finite inputs, where v_est is NaN) are recomputed with
+        # it at the end. At R = 0.5 exactly it floors v at 1e-10, which gives
+        # alpha = 0 and tau = M below without the exact call
+        at_half = L == 0
+        exact = np.flatnonzero(~(np.abs(v_est, out=scratch) >= EXACT_BELOW) & ~at_half)
+        np.copyto(v_est, 1e-10, where=at_half)
+        
+        # Equation 5: alpha = L / v
+        np.divide(L, v_est, out=alpha_est)
+        
+        # Equation 6: tau = M - alpha / (2v) * (2R - 1)
+        np.subtract(R, 0.5, out=tau_est)
+        tau_est *= alpha_est
+        tau_est /= v_est
+        np.subtract(M_obs, tau_est, out=tau_est)
+        np.fmax(tau_est, 0.0, out=tau_est)  # Like inverse_ez, a NaN tau becomes 0
+        
+        if len(exact):
+            for estimate, value in zip(estimates, inverse_ez(R_obs[exact], M_obs[exact], V_obs[exact])):
+                estimate[exact] = value
+    
+    def validate(self, n_R=2001, n_V=41):
+        """
+        Measure the maximum absolute error against inverse_ez on a validation grid.
+        
+        The grid uses R values whose log odds fall between the table's nodes
+        and log-spaced variances from 1e-4 to 1 (with M_obs = 2 so tau stays
+        positive). The measured bound therefore only holds for V_obs >= 1e-4:
+        the interpolation error of a is scaled by V**(-1/4) in v = a / V**(1/4),
+        so below that the absolute error grows like V**(-1/4) (only the
+        relative error stays the same).
+        
+        Returns:
+        dict: Maximum absolute error of 'v', 'alpha' and 'tau' (also stored in max_error)
+        """
+        L = np.linspace(L_MIN, L_MAX, n_R) + self.step / np.pi
+        R = 1 / (1 + np.exp(-L[L < L_MAX]))
+        V = np.logspace(-4, 0, n_V)
+        R, V = np.meshgrid(R, V)
+        M = np.full_like(R, 2.0)
+        
+        approximate = self(R, M, V)
+        exact = inverse_ez(R, M, V)
+        self.max_error = {name: float(np.max(np.abs(x - y)))
+                          for name, x, y in zip(('v', 'alpha', 'tau'), approximate, exact)}
+        return self.max_error
+    
+    def save(self, path):
+        """
+        Save the table (and its validated error) to an .npz file.
+        """
+        errors = self.max_error or {}
+        np.savez(path, values=self.values,
+                 max_error=np.array([errors.get(name, np.nan) for name in ('v', 'alpha', 'tau')]))
+    
+    @classmethod
+    def load(cls, path):
+        """
+        Load a table saved with save.
+        """
+        with np.load(path) as data:
+            errors = data['max_error']
+            max_error = None if np.all(np.isnan(errors)) else dict(zip(('v', 'alpha', 'tau'), errors.tolist()))
+            return cls(data['values'], max_error)
+
+def cached_table(tolerance=1e-6, cache_dir=None):
+    """
+    Load the lookup table for a tolerance from the disk cache, building and caching it if needed.
+    
+    The cache file is keyed by the tolerance, so every process asking for
+    the same tolerance reuses one build.
+    
+    Parameters:
+    tolerance (float): Maximum absolute error allowed for v, alpha and tau
+    cache_dir (str): Cache directory (defaults to CACHE_DIR, set by EZ_CACHE_DIR)
+    
+    Returns:
+    InverseLookupTable: Validated table
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    path = os.path.join(cache_dir, f'inverse_ez_logit_table_{tolerance:g}.npz')
+    
+    if os.path.exists(path):
+        return InverseLookupTable.load(path)
+    
+    table = InverseLookupTable.build_to_tolerance(tolerance)
+    os.makedirs(cache_dir, exist_ok=True)
+    
+    # Write to a temporary file first so concurrent readers never see a partial table
+    temp_path = f"{path}.{os.getpid()}.tmp.npz"
+    table.save(temp_path)
+    os.replace(temp_path, path)
+    return table
@@ -6,7 +6,7 @@ cd "$(dirname "$0")/.."
 # Create directories if they don't exist
 mkdir -p results
 
-# Run the simulation
-python3 /workspace/EZ-diffusion-model/src/simulation_main.py
+# Run the simulation (options such as --iterations or --N-values are passed through)
+python3 src/cli.py "$@"
 
 # Acknowledging reference to and help from ChatGPT/AI tools
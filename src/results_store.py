@@ -0,0 +1,224 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+import time
+import sqlite3
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.simulation_main import RESULT_COLUMNS, result_columns
+
+# Columns that can be filtered on or binned by
+QUERY_COLUMNS = ('N',) + RESULT_COLUMNS
+
+# Summary columns computed by aggregate()
+AGGREGATE_COLUMNS = ('count', 'mean_bias_v', 'mean_bias_alpha', 'mean_bias_tau', 'mse')
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS runs (run_id INTEGER PRIMARY KEY, created REAL, description TEXT, rows INTEGER)",
+    "CREATE TABLE IF NOT EXISTS results (run_id INTEGER, N INTEGER, "
+    + ", ".join(f"{name} REAL" for name in RESULT_COLUMNS) + ")",
+    "CREATE INDEX IF NOT EXISTS results_v ON results (N, v_true)",
+    "CREATE INDEX IF NOT EXISTS results_alpha ON results (N, alpha_true)",
+    "CREATE INDEX IF NOT EXISTS results_tau ON results (N, tau_true)"
+]
+
+class ResultsStore:
+    """
+    Indexed, file-based store of per-iteration simulate-and-recover results.
+    
+    Rows from any number of run_simulation calls are appended to one sqlite
+    database, with indexes on (N, v_true), (N, alpha_true) and (N, tau_true),
+    so range queries and binned aggregates such as "mean alpha bias for
+    v_true < 0.7 at N = 40" read only the matching rows instead of parsing
+    whole results files. Queries without an N filter are restricted to the
+    stored N values (see N_values), so they also search the indexes one N at
+    a time instead of scanning the table. run_id is deliberately not
+    indexed: every index makes appends slower, and run filters are usually
+    combined with N.
+    
+    Filters are given as keyword arguments: N (a value or list of values),
+    run_id, and any column of RESULT_COLUMNS as a (low, high) range with
+    low <= value < high, where either bound may be None.
+    """
+    
+    def __init__(self, path):
+        """
+        Parameters:
+        path (str): Database file (created if it does not exist)
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            for statement in _SCHEMA:
+                self.connection.execute(statement)
+    
+    def close(self):
+        self.connection.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+        return False
+    
+    def append(self, results, description=None):
+        """
+        Append the per-iteration rows of a run_simulation result as a new run.
+        
+        Entries without per-iteration rows (streaming runs) are skipped.
+        
+        Parameters:
+        results (dict): Results of run_simulation
+        description (str): Optional note stored with the run
+        
+        Returns:
+        int: The run_id of the appended rows
+        """
+        with self.connection:
+            run_id = self.connection.execute("INSERT INTO runs (created, description, rows) VALUES (?, ?, 0)",
+                                             (time.time(), description)).lastrowid
+            count = 0
+            
+            insert = (f"INSERT INTO results (run_id, N, {', '.join(RESULT_COLUMNS)}) "
+                      f"VALUES ({', '.join('?' * (len(RESULT_COLUMNS) + 2))})")
+            for N, data in results.items():
+                if 'v_true' not in data:
+                    continue
+                
+                columns = result_columns(data)
+                rows = zip(*(columns[name].tolist() for name in RESULT_COLUMNS))
+                self.connection.executemany(insert, ((run_id, int(N), *row) for row in rows))
+                count += len(columns['v_true'])
+            
+            self.connection.execute("UPDATE runs SET rows = ? WHERE run_id = ?", (count, run_id))
+        
+        return run_id
+    
+    def runs(self):
+        """
+        Return the stored runs as a list of (run_id, created, description, rows) tuples.
+        """
+        return self.connection.execute(
+            "SELECT run_id, created, description, rows FROM runs ORDER BY run_id").fetchall()
+    
+    def N_values(self):
+        """
+        Return the distinct stored sample sizes, in increasing order.
+        
+        Each value is one indexed MIN lookup, so this does not scan the table.
+        """
+        values = []
+        while (N := self.connection.execute("SELECT MIN(N) FROM results WHERE N > ?",
+                                            (values[-1] if values else -1,)).fetchone()[0]) is not None:
+            values.append(N)
+        return values
+    
+    def query(self, columns=QUERY_COLUMNS, **filters):
+        """
+        Return the rows matching the filters, in the order they were appended.
+        
+        Parameters:
+        columns (tuple): Columns to return (from QUERY_COLUMNS)
+        **filters: N, run_id and column ranges (see the class docstring)
+        
+        Returns:
+        dict: Column name to NumPy array
+        """
+        columns = [_checked_column(name) for name in columns]
+        where, parameters = _where_clause(self._with_N(filters))
+        
+        # Keep the order in which the rows were appended, whichever index is used
+        rows = self.connection.execute(f"SELECT {', '.join(columns)} FROM results{where} ORDER BY rowid",
+                                       parameters).fetchall()
+        table = np.array(rows, dtype=float).reshape(len(rows), len(columns))
+        
+        return {name: table[:, i].astype(np.int64) if name == 'N' else table[:, i]
+                for i, name in enumerate(columns)}
+    
+    def aggregate(self, by=None, edges=None, **filters):
+        """
+        Count, mean biases and mean squared error of the matching rows, per N and bin.
+        
+        Parameters:
+        by (str): Column to bin by (e.g. 'v_true'), or None for one group per N
+        edges (array): Increasing bin edges for by; bin i holds edges[i] <= value < edges[i + 1]
+        **filters: N, run_id and column ranges (see the class docstring)
+        
+        Returns:
+        dict: 'N', 'bin' (index into the bins, -1 without binning) and
+        AGGREGATE_COLUMNS as arrays, one entry per non-empty (N, bin) group
+        """
+        where, parameters = _where_clause(self._with_N(filters))
+        summary = ("COUNT(*), AVG(bias_v), AVG(bias_alpha), AVG(bias_tau), AVG(squared_error)")
+        
+        if by is None:
+            sql = f"SELECT N, -1, {summary} FROM results{where} GROUP BY N ORDER BY N"
+        else:
+            by = _checked_column(by)
+            edges = np.asarray(edges, dtype=float)
+            if edges.ndim != 1 or len(edges) < 2 or np.any(np.diff(edges) <= 0):
+                raise ValueError("edges must be an increasing sequence of at least two values")
+            
+            # Join against the bins so each (N, bin) pair is an indexed range scan
+            bins = ", ".join("(?, ?, ?)" for _ in range(len(edges) - 1))
+            bin_parameters = [value for i in range(len(edges) - 1) for value in (i, edges[i], edges[i + 1])]
+            join = f" JOIN results ON results.{by} >= bins.low AND results.{by} < bins.high"
+            where = where.replace(" WHERE ", " AND ", 1) if where else ""
+            sql = (f"WITH bins(bin, low, high) AS (VALUES {bins}) "
+                   f"SELECT N, bin, {summary} FROM bins{join}{where} GROUP BY N, bin ORDER BY N, bin")
+            parameters = bin_parameters + parameters
+        
+        rows = self.connection.execute(sql, parameters).fetchall()
+        table = np.array(rows, dtype=float).reshape(len(rows), 2 + len(AGGREGATE_COLUMNS))
+        
+        output = {'N': table[:, 0].astype(np.int64), 'bin': table[:, 1].astype(np.int64)}
+        for i, name in enumerate(AGGREGATE_COLUMNS):
+            output[name] = table[:, 2 + i].astype(np.int64) if name == 'count' else table[:, 2 + i]
+        return output
+
+    def _with_N(self, filters):
+        """
+        Return filters with an explicit N filter, so the (N, parameter) indexes apply.
+        """
+        if filters.get('N') is None:
+            filters = {**filters, 'N': self.N_values()}
+        return filters
+
+def _checked_column(name):
+    """
+    Return name if it is a queryable column (column names cannot be SQL parameters).
+    """
+    if name not in QUERY_COLUMNS:
+        raise ValueError(f"Unknown column: {name!r}")
+    return name
+
+def _where_clause(filters):
+    """
+    Build the WHERE clause and its parameters for N, run_id and column range filters.
+    """
+    conditions = []
+    parameters = []
+    
+    for name, value in filters.items():
+        if value is None:
+            continue
+        
+        if name in ('N', 'run_id'):
+            values = [int(x) for x in np.atleast_1d(value)]
+            conditions.append(f"{name} IN ({', '.join('?' * len(values))})")
+            parameters.extend(values)
+        else:
+            low, high = value
+            if low is not None:
+                conditions.append(f"{_checked_column(name)} >= ?")
+                parameters.append(float(low))
+            if high is not None:
+                conditions.append(f"{_checked_column(name)} < ?")
+                parameters.append(float(high))
+    
+    return (" WHERE " + " AND ".join(conditions) if conditions else ""), parameters
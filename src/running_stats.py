@@ -0,0 +1,99 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import numpy as np
+
+def merge_moments(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+    """
+    Merge two sets of running moments (count, mean, sum of squared deviations).
+    
+    Uses the pairwise update of Chan et al., which generalizes Welford's
+    algorithm to combining whole batches. Works element-wise on arrays, so it
+    can merge many independent accumulators at once.
+    
+    Parameters:
+    n_a, mean_a, m2_a: Count, mean and sum of squared deviations of the first set
+    n_b, mean_b, m2_b: Count, mean and sum of squared deviations of the second set
+    
+    Returns:
+    tuple: (n, mean, m2) - moments of the combined set
+    """
+    n_a = np.asarray(n_a, dtype=float)
+    n_b = np.asarray(n_b, dtype=float)
+    n = n_a + n_b
+    
+    # Avoid division by zero when both sets are empty
+    safe_n = np.where(n > 0, n, 1.0)
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (n_b / safe_n)
+    m2 = m2_a + m2_b + delta**2 * (n_a * n_b / safe_n)
+    
+    return n, mean, m2
+
+class RunningStats:
+    """
+    Streaming mean and variance of a fixed number of quantities.
+    
+    Batches of observations are folded in with merge_moments, so memory stays
+    constant however many observations are seen.
+    """
+    
+    def __init__(self, size):
+        """
+        Parameters:
+        size (int): Number of quantities tracked side by side
+        """
+        self.count = 0
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+    
+    def update(self, batch):
+        """
+        Fold a batch of observations into the running moments.
+        
+        Single-precision batches are reduced with float64 accumulators
+        without first making a float64 copy of the batch.
+        
+        Parameters:
+        batch (array): Observations with shape (n, size)
+        """
+        batch = np.asarray(batch)
+        if batch.dtype != np.float32:
+            batch = batch.astype(float, copy=False)
+        if len(batch) == 0:
+            return
+        
+        batch_mean = np.mean(batch, axis=0, dtype=float)
+        batch_m2 = np.sum((batch - batch_mean.astype(batch.dtype))**2, axis=0, dtype=float)
+        self._merge(len(batch), batch_mean, batch_m2)
+    
+    def merge(self, other):
+        """
+        Fold another RunningStats into this one.
+        
+        Parameters:
+        other (RunningStats): Moments of a disjoint set of observations
+        """
+        if other.count:
+            self._merge(other.count, other.mean, other.m2)
+    
+    def _merge(self, count, mean, m2):
+        _, self.mean, self.m2 = merge_moments(self.count, self.mean, self.m2, count, mean, m2)
+        self.count += int(count)
+    
+    @property
+    def variance(self):
+        """
+        Sample variance (ddof=1) of each quantity.
+        """
+        if self.count < 2:
+            return np.full_like(self.mean, np.nan)
+        return self.m2 / (self.count - 1)
+    
+    @property
+    def standard_error(self):
+        """
+        Monte Carlo standard error of each running mean.
+        """
+        if self.count < 2:
+            return np.full_like(self.mean, np.nan)
+        return np.sqrt(self.variance / self.count)
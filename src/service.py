@@ -0,0 +1,391 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+import json
+import errno
+import asyncio
+import argparse
+import tempfile
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.running_stats import RunningStats
+from src.simulation_main import PARAMETER_RANGES, DEFAULT_CHUNK_SIZE, chunk_seed, chunk_sizes, simulate_chunk
+
+# Default location of the service socket
+SOCKET_PATH = os.path.join(tempfile.gettempdir(), 'ez-simulation.sock')
+
+# Options a sweep request may set, with their defaults (as in run_simulation)
+SPEC_DEFAULTS = {'iterations': 1000, 'N_values': [10, 40, 4000], 'seed': None, 'ranges': {},
+                 'chunk_size': DEFAULT_CHUNK_SIZE, 'compact': False}
+
+# Most chunks one request may queue on the pool (all are submitted up front)
+MAX_CHUNKS = 10000
+
+# Most iterations in one chunk, which bounds the memory a request takes in a worker
+MAX_CHUNK_SIZE = 1000000
+
+# Events that end a request's stream
+_FINAL_EVENTS = ('done', 'error')
+
+def normalize_spec(spec):
+    """
+    Validate a sweep request and fill in the defaults.
+    
+    Ranges must be two finite numbers with low < high, sample sizes at least
+    2, chunks at most MAX_CHUNK_SIZE iterations and the request at most
+    MAX_CHUNKS chunks.
+    
+    Parameters:
+    spec (dict): Request options (see SPEC_DEFAULTS)
+    
+    Returns:
+    dict: Complete spec with plain JSON types, equal for equivalent requests
+    """
+    unknown = set(spec) - set(SPEC_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown request options: {', '.join(sorted(unknown))}")
+    
+    spec = {**SPEC_DEFAULTS, **spec}
+    ranges = {**PARAMETER_RANGES, **spec['ranges']}
+    if set(ranges) != set(PARAMETER_RANGES):
+        raise ValueError(f"Ranges can only be given for {', '.join(PARAMETER_RANGES)}")
+    for name, bounds in ranges.items():
+        if len(bounds) != 2 or not (np.all(np.isfinite(np.asarray(bounds, dtype=float)))
+                                    and float(bounds[0]) < float(bounds[1])):
+            raise ValueError(f"Range for {name} must be two finite numbers [low, high] with low < high, "
+                             f"got {bounds}")
+    
+    normalized = {
+        'iterations': int(spec['iterations']),
+        'N_values': [int(N) for N in spec['N_values']],
+        'seed': None if spec['seed'] is None else int(spec['seed']),
+        'ranges': {name: [float(bound) for bound in ranges[name]] for name in sorted(ranges)},
+        'chunk_size': int(spec['chunk_size']),
+        'compact': bool(spec['compact'])
+    }
+    if normalized['iterations'] < 1 or normalized['chunk_size'] < 1 or not normalized['N_values']:
+        raise ValueError("iterations and chunk_size must be at least 1 and N_values must not be empty")
+    if min(normalized['N_values']) < 2:
+        raise ValueError("Sample sizes in N_values must be at least 2")
+    
+    chunk_size = min(normalized['iterations'], normalized['chunk_size'])
+    if chunk_size > MAX_CHUNK_SIZE:
+        raise ValueError(f"Chunks of {chunk_size} iterations are larger than the limit of {MAX_CHUNK_SIZE}; "
+                         f"use a smaller chunk_size")
+    
+    chunks = len(normalized['N_values']) * -(-normalized['iterations'] // normalized['chunk_size'])
+    if chunks > MAX_CHUNKS:
+        raise ValueError(f"Request needs {chunks} chunks, more than the limit of {MAX_CHUNKS}; "
+                         f"use a larger chunk_size")
+    return normalized
+
+class _Job:
+    """
+    One running sweep and the events it has published so far.
+    
+    Late subscribers (deduplicated requests) first receive the events they
+    missed, so every subscriber sees the complete stream.
+    """
+    
+    def __init__(self, spec):
+        self.spec = spec
+        self.events = []
+        self.subscribers = []
+    
+    def publish(self, event):
+        self.events.append(event)
+        for queue in self.subscribers:
+            queue.put_nowait(event)
+    
+    def subscribe(self):
+        queue = asyncio.Queue()
+        for event in self.events:
+            queue.put_nowait(event)
+        self.subscribers.append(queue)
+        return queue
+
+class SimulationService:
+    """
+    Local asyncio server running simulate-and-recover sweeps on a warm process pool.
+    
+    Clients connect to a Unix socket and send one JSON object per line, each
+    with an optional 'id' and the sweep options of SPEC_DEFAULTS. For every
+    request the server streams JSON lines tagged with that id: a 'progress'
+    event per completed chunk, a 'result' event with the summary of each N
+    as soon as all its chunks are done, and finally 'done' with all results
+    (or 'error'). Identical seeded requests that arrive while the first one is
+    still running share a single computation.
+    
+    The sweeps use the chunked engine of run_simulation in streaming mode
+    (summaries only), so a request gives the same summaries as
+    run_simulation(..., keep_rows=False) with the same options.
+    """
+    
+    def __init__(self, socket_path=SOCKET_PATH, workers=None):
+        """
+        Parameters:
+        socket_path (str): Path of the Unix socket to listen on
+        workers (int): Number of processes in the pool (defaults to the CPU count)
+        """
+        self.socket_path = socket_path
+        self.workers = workers or os.cpu_count() or 1
+        self.requests = 0
+        self.jobs_started = 0
+        self._jobs = {}
+        self._tasks = set()
+        self._pool = None
+        self._server = None
+        self._socket_id = None
+    
+    async def start(self):
+        """
+        Start the process pool and begin listening on the socket.
+        
+        A socket file left behind by a service that is gone is replaced, but
+        if a server still answers at socket_path, OSError (EADDRINUSE) is
+        raised instead of taking the path over.
+        """
+        if os.path.exists(self.socket_path):
+            if await _is_listening(self.socket_path):
+                raise OSError(errno.EADDRINUSE, f"A service is already listening on {self.socket_path}")
+            os.unlink(self.socket_path)
+        
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        
+        # Start every worker now so the first request does not pay for it
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, os.getpid) for _ in range(self.workers)))
+        
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+        self._socket_id = _file_id(self.socket_path)
+    
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+    
+    async def close(self):
+        """
+        Stop listening and shut the process pool down.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        
+        # Remove the socket only if it is still the one this instance created
+        if self._socket_id is not None and _file_id(self.socket_path) == self._socket_id:
+            os.unlink(self.socket_path)
+        self._socket_id = None
+    
+    async def _handle_connection(self, reader, writer):
+        requests = []
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    requests.append(asyncio.create_task(self._handle_request(line, writer)))
+            await asyncio.gather(*requests)
+        finally:
+            writer.close()
+    
+    async def _handle_request(self, line, writer):
+        self.requests += 1
+        request_id = None
+        
+        try:
+            request = json.loads(line)
+            request_id = request.pop('id', None)
+            queue = self._subscribe(normalize_spec(request))
+        except (ValueError, TypeError, AttributeError) as e:
+            await self._send(writer, {'id': request_id, 'event': 'error', 'message': str(e)})
+            return
+        
+        while True:
+            event = await queue.get()
+            await self._send(writer, {'id': request_id, **event})
+            if event['event'] in _FINAL_EVENTS:
+                return
+    
+    async def _send(self, writer, event):
+        writer.write((json.dumps(event) + '\n').encode())
+        await writer.drain()
+    
+    def _subscribe(self, spec):
+        """
+        Return an event queue for a spec, joining an identical running sweep if there is one.
+        """
+        key = json.dumps(spec, sort_keys=True) if spec['seed'] is not None else None
+        job = self._jobs.get(key) if key is not None else None
+        
+        if job is None:
+            job = _Job(spec)
+            self.jobs_started += 1
+            if key is not None:
+                self._jobs[key] = job
+            
+            # Keep a reference so the running task is not garbage collected
+            task = asyncio.create_task(self._run_job(job, key))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        
+        return job.subscribe()
+    
+    async def _run_job(self, job, key):
+        try:
+            await self._run_sweep(job)
+        except Exception as e:
+            job.publish({'event': 'error', 'message': f"{type(e).__name__}: {e}"})
+        finally:
+            self._jobs.pop(key, None)
+    
+    async def _run_sweep(self, job):
+        """
+        Run a sweep's chunks on the pool, publishing progress and per-N results.
+        """
+        spec = job.spec
+        loop = asyncio.get_running_loop()
+        root = np.random.SeedSequence(spec['seed'])
+        sizes = chunk_sizes(spec['iterations'], spec['chunk_size'])
+        ranges = {name: tuple(bounds) for name, bounds in spec['ranges'].items()}
+        
+        pending = {}
+        for N in spec['N_values']:
+            for c, size in enumerate(sizes):
+                future = loop.run_in_executor(self._pool, simulate_chunk, N, size, chunk_seed(root, N, c),
+                                              ranges, False, spec['compact'])
+                pending[future] = (N, c)
+        
+        chunks = {N: {} for N in spec['N_values']}
+        results = {}
+        total = len(pending)
+        
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                N, c = pending.pop(future)
+                chunks[N][c] = future.result()[0]
+                job.publish({'event': 'progress', 'completed': total - len(pending), 'total': total})
+                
+                if len(chunks[N]) == len(sizes):
+                    # Merge in chunk order, as the chunked engine does
+                    moments = RunningStats(4)
+                    for index in range(len(sizes)):
+                        moments.merge(chunks[N][index])
+                    results[str(N)] = _summary(moments)
+                    job.publish({'event': 'result', 'N': N, **results[str(N)]})
+        
+        job.publish({'event': 'done', 'results': results})
+
+async def _is_listening(socket_path):
+    """
+    Return whether a server accepts connections on a Unix socket path.
+    """
+    try:
+        _, writer = await asyncio.open_unix_connection(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        return False
+    writer.close()
+    await writer.wait_closed()
+    return True
+
+def _file_id(path):
+    """
+    Return (device, inode) of a file, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+def _summary(moments):
+    """
+    Summary part of a chunked-engine results entry, as plain floats.
+    """
+    names = ('bias_v', 'bias_alpha', 'bias_tau', 'squared_error')
+    summary = {'iterations': moments.count}
+    summary.update({f'avg_{name}': float(value) for name, value in zip(names, moments.mean)})
+    summary.update({f'se_{name}': float(value) for name, value in zip(names, moments.standard_error)})
+    return summary
+
+async def stream_request(spec, socket_path=SOCKET_PATH, request_id=None):
+    """
+    Send one sweep request to a running service and yield its events as they arrive.
+    
+    Parameters:
+    spec (dict): Sweep options (see SPEC_DEFAULTS)
+    socket_path (str): Socket of the service
+    request_id: Optional id echoed in every event
+    
+    Yields:
+    dict: Events ('progress', 'result', then 'done' or 'error')
+    """
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    try:
+        writer.write((json.dumps({'id': request_id, **spec}) + '\n').encode())
+        await writer.drain()
+        
+        while line := await reader.readline():
+            event = json.loads(line)
+            yield event
+            if event['event'] in _FINAL_EVENTS:
+                break
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+def submit(spec, socket_path=SOCKET_PATH, on_event=None):
+    """
+    Run a sweep on a running service and wait for its results.
+    
+    Parameters:
+    spec (dict): Sweep options (see SPEC_DEFAULTS)
+    socket_path (str): Socket of the service
+    on_event (callable): Called with every event, e.g. to show progress
+    
+    Returns:
+    dict: Summary for each N value
+    """
+    async def collect():
+        async for event in stream_request(spec, socket_path):
+            if on_event is not None:
+                on_event(event)
+            if event['event'] == 'error':
+                raise RuntimeError(event['message'])
+            if event['event'] == 'done':
+                return {int(N): summary for N, summary in event['results'].items()}
+    
+    return asyncio.run(collect())
+
+def main(argv=None):
+    """
+    Run the simulation service until interrupted.
+    """
+    parser = argparse.ArgumentParser(description="Serve simulate-and-recover sweeps on a local Unix socket.")
+    parser.add_argument('--socket', default=SOCKET_PATH, help=f"Socket path (default: {SOCKET_PATH})")
+    parser.add_argument('--workers', type=int, help="Processes in the pool (default: CPU count)")
+    args = parser.parse_args(argv)
+    
+    service = SimulationService(args.socket, args.workers)
+    print(f"Serving on {args.socket} with {service.workers} workers")
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        if e.errno != errno.EADDRINUSE:
+            raise
+        parser.exit(1, f"{e.strerror}\n")
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,60 @@
 # Acknowledging reference to and help from ChatGPT/AI tools
 
+import sys
+import os
 import numpy as np
 import random
-import scipy.stats as stats
+from collections import OrderedDict
+
+# Add the repository root to the path so the instrumentation module is shared
+# whether this file is imported as a top-level module or as src.simulate_and_recover
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.instrumentation import instrumentation
+
+def _scipy_stats():
+    """
+    Import scipy.stats on first use; it is only needed by the legacy scalar
+    sampler and dominates the import time of this module.
+    """
+    import scipy.stats
+    return scipy.stats
+
+# Types taken by the scalar fast paths of forward_ez and inverse_ez
+_SCALAR_TYPES = (int, float, np.number)
+
+def _as_output(x):
+    """
+    Return 0-d arrays as NumPy scalars so scalar inputs keep scalar outputs.
+    """
+    x = np.asarray(x)
+    return x[()] if x.ndim == 0 else x
 
 def forward_ez(v, alpha, tau):
     """
     Forward EZ diffusion model equations.
     
+    Accepts scalars or NumPy arrays of any (broadcastable) shape and
+    evaluates the equations element-wise.
+    
     Parameters:
-    v (float): Drift rate
-    alpha (float): Boundary separation
-    tau (float): Non-decision time
+    v (float or array): Drift rate
+    alpha (float or array): Boundary separation
+    tau (float or array): Non-decision time
     
     Returns:
     tuple: (R_pred, M_pred, V_pred) - predicted accuracy, mean RT, and variance of RT
     """
+    # Scalar calls (the serial loop) skip the array machinery
+    if isinstance(v, _SCALAR_TYPES) and isinstance(alpha, _SCALAR_TYPES) and isinstance(tau, _SCALAR_TYPES):
+        return _forward_ez_scalar(v, alpha, tau)
+    
+    v = np.asarray(v, dtype=float)
+    alpha = np.asarray(alpha, dtype=float)
+    tau = np.asarray(tau, dtype=float)
+    
     # Ensure parameters are valid
-    if v == 0:
-        v = 1e-10  # Avoid division by zero
+    v = np.where(v == 0, 1e-10, v)  # Avoid division by zero
     
     # Substitute parameter names (v, alpha, tau) for (v, a, t) in the equations
     y = np.exp(-alpha * v)
@@ -32,27 +68,96 @@ def forward_ez(v, alpha, tau):
     # Equation 3: Predicted variance of RT
     V_pred = (alpha / (2 * v**3)) * ((1 - 2*alpha*v*y - y**2) / (1 + y)**2)
     
+    return _as_output(R_pred), _as_output(M_pred), _as_output(V_pred)
+
+def _forward_ez_scalar(v, alpha, tau):
+    """
+    forward_ez for a single parameter triple, with the guard as a plain branch.
+    """
+    # Ensure parameters are valid
+    if v == 0:
+        v = 1e-10  # Avoid division by zero
+    
+    y = np.exp(-alpha * v)
+    R_pred = 1 / (1 + y)
+    M_pred = tau + (alpha / (2 * v)) * ((1 - y) / (1 + y))
+    V_pred = (alpha / (2 * v**3)) * ((1 - 2*alpha*v*y - y**2) / (1 + y)**2)
+    
     return R_pred, M_pred, V_pred
 
 def inverse_ez(R_obs, M_obs, V_obs):
     """
     Inverse EZ diffusion model equations.
     
+    Accepts scalars or NumPy arrays of any (broadcastable) shape. The
+    guards below are applied element-wise with masks, so a whole batch of
+    observed statistics is recovered in a single vectorized pass.
+    
     Parameters:
-    R_obs (float): Observed accuracy
-    M_obs (float): Observed mean RT
-    V_obs (float): Observed variance of RT
+    R_obs (float or array): Observed accuracy
+    M_obs (float or array): Observed mean RT
+    V_obs (float or array): Observed variance of RT
     
     Returns:
     tuple: (v_est, alpha_est, tau_est) - estimated drift rate, boundary separation, and non-decision time
     """
+    # Scalar calls (the serial loop) skip the array machinery; instrumented
+    # calls take the array path, which counts the guard activations
+    if (isinstance(R_obs, _SCALAR_TYPES) and isinstance(M_obs, _SCALAR_TYPES) and isinstance(V_obs, _SCALAR_TYPES)
+            and not instrumentation.enabled):
+        return _inverse_ez_scalar(R_obs, M_obs, V_obs)
+    
+    M_obs = np.asarray(M_obs, dtype=float)
+    V_obs = np.asarray(V_obs, dtype=float)
+    
+    # Count guard activations only when instrumentation is on
+    if instrumentation.enabled:
+        R_raw = np.asarray(R_obs, dtype=float)
+        instrumentation.count('inverse_R_clipped', np.count_nonzero((R_raw < 0.001) | (R_raw > 0.999)))
+        instrumentation.count('inverse_V_floored', np.count_nonzero(V_obs <= 0))
+    
+    # Ensure parameters are valid
+    R_obs = np.clip(np.asarray(R_obs, dtype=float), 0.001, 0.999)  # Avoid log(0) or division by zero
+    
+    V_obs = np.where(V_obs <= 0, 1e-10, V_obs)  # Avoid division by zero or sqrt of negative number
+    
+    # Intermediate calculation L
+    L = np.log(R_obs / (1 - R_obs))
+    
+    # Make sure the expression under the 4th root is positive
+    expression = L * (R_obs**2 * L - R_obs * L + R_obs - 0.5) / V_obs
+    if instrumentation.enabled:
+        instrumentation.count('fourth_root_clamped', np.count_nonzero(expression <= 0))
+    expression = np.where(expression <= 0, 1e-10, expression)
+    
+    # Equation 4: Estimated drift rate
+    v_est = np.sign(R_obs - 0.5) * expression**(1/4)
+    
+    # Avoid division by zero
+    v_est = np.where(np.abs(v_est) < 1e-10, np.where(v_est >= 0, 1e-10, -1e-10), v_est)
+    
+    # Equation 5: Estimated boundary separation
+    alpha_est = L / v_est
+    
+    # Equation 6: Estimated non-decision time
+    y_est = np.exp(-v_est * alpha_est)
+    tau_est = M_obs - (alpha_est / (2 * v_est)) * ((1 - y_est) / (1 + y_est))
+    
+    # Sanity check for non-decision time (shouldn't be negative)
+    tau_est = np.where(tau_est > 0.0, tau_est, 0.0)
+    
+    return _as_output(v_est), _as_output(alpha_est), _as_output(tau_est)
+
+def _inverse_ez_scalar(R_obs, M_obs, V_obs):
+    """
+    inverse_ez for a single set of statistics, with the guards as plain branches.
+    """
     # Ensure parameters are valid
     R_obs = np.clip(R_obs, 0.001, 0.999)  # Avoid log(0) or division by zero
     
     if V_obs <= 0:
         V_obs = 1e-10  # Avoid division by zero or sqrt of negative number
     
-    # Intermediate calculation L
     L = np.log(R_obs / (1 - R_obs))
     
     # Make sure the expression under the 4th root is positive
@@ -60,25 +165,207 @@ def inverse_ez(R_obs, M_obs, V_obs):
     if expression <= 0:
         expression = 1e-10
     
-    # Equation 4: Estimated drift rate
     v_est = np.sign(R_obs - 0.5) * expression**(1/4)
     
     # Avoid division by zero
     if abs(v_est) < 1e-10:
         v_est = 1e-10 if v_est >= 0 else -1e-10
     
-    # Equation 5: Estimated boundary separation
     alpha_est = L / v_est
-    
-    # Equation 6: Estimated non-decision time
     y_est = np.exp(-v_est * alpha_est)
     tau_est = M_obs - (alpha_est / (2 * v_est)) * ((1 - y_est) / (1 + y_est))
     
     # Sanity check for non-decision time (shouldn't be negative)
-    tau_est = max(0.0, tau_est)
+    tau_est = tau_est if tau_est > 0.0 else 0.0
     
     return v_est, alpha_est, tau_est
 
+def forward_ez_jacobian(v, alpha, tau):
+    """
+    Forward EZ equations together with their closed-form Jacobian.
+    
+    Evaluated element-wise over arrays like forward_ez, so derivatives for a
+    whole batch cost a few extra array operations instead of finite
+    differences. Inputs are treated after the same guard as forward_ez
+    (v == 0 is replaced by 1e-10).
+    
+    Parameters:
+    v (float or array): Drift rate
+    alpha (float or array): Boundary separation
+    tau (float or array): Non-decision time
+    
+    Returns:
+    tuple: (R_pred, M_pred, V_pred, jacobian) - the forward_ez values and an
+    array of shape (..., 3, 3) whose rows are (R, M, V) and columns (v, alpha, tau)
+    """
+    R_pred, M_pred, V_pred = forward_ez(v, alpha, tau)
+    
+    v, alpha, tau = np.broadcast_arrays(np.asarray(v, dtype=float), np.asarray(alpha, dtype=float),
+                                        np.asarray(tau, dtype=float))
+    v = np.where(v == 0, 1e-10, v)
+    y = np.exp(-alpha * v)
+    
+    # Derivatives of R = 1 / (1 + y) with y = exp(-alpha * v)
+    dR = y / (1 + y)**2
+    
+    # M = tau + alpha / (2v) * h with h = (1 - y) / (1 + y) and dh/d(alpha v) = (1 - h^2) / 2
+    h = (1 - y) / (1 + y)
+    dh = (1 - h**2) / 2
+    
+    # V = alpha / (2v^3) * g with g = (1 - 2 alpha v y - y^2) / (1 + y)^2
+    numerator = 1 - 2*alpha*v*y - y**2
+    g = numerator / (1 + y)**2
+    dg = (-2*y + 2*alpha*v*y + 2*y**2) / (1 + y)**2 + 2*y*numerator / (1 + y)**3
+    
+    jacobian = np.empty(v.shape + (3, 3))
+    jacobian[..., 0, 0] = alpha * dR
+    jacobian[..., 0, 1] = v * dR
+    jacobian[..., 0, 2] = 0.0
+    jacobian[..., 1, 0] = -alpha * h / (2 * v**2) + alpha**2 * dh / (2 * v)
+    jacobian[..., 1, 1] = h / (2 * v) + alpha * dh / 2
+    jacobian[..., 1, 2] = 1.0
+    jacobian[..., 2, 0] = -3 * alpha * g / (2 * v**4) + alpha**2 * dg / (2 * v**3)
+    jacobian[..., 2, 1] = g / (2 * v**3) + alpha * dg / (2 * v**2)
+    jacobian[..., 2, 2] = 0.0
+    
+    return R_pred, M_pred, V_pred, jacobian
+
+def inverse_ez_jacobian(R_obs, M_obs, V_obs):
+    """
+    Inverse EZ equations together with their closed-form Jacobian.
+    
+    Evaluated element-wise over arrays like inverse_ez. Wherever one of the
+    inverse_ez guards is active (R clipped, V floored, the fourth-root
+    argument or the drift rate floored, tau clamped at 0), the guarded value
+    does not depend on the input and the corresponding derivatives are 0.
+    
+    Parameters:
+    R_obs (float or array): Observed accuracy
+    M_obs (float or array): Observed mean RT
+    V_obs (float or array): Observed variance of RT
+    
+    Returns:
+    tuple: (v_est, alpha_est, tau_est, jacobian) - the inverse_ez values and an
+    array of shape (..., 3, 3) whose rows are (v, alpha, tau) and columns (R, M, V)
+    """
+    v_est, alpha_est, tau_est = inverse_ez(R_obs, M_obs, V_obs)
+    
+    R_obs, M_obs, V_obs = np.broadcast_arrays(np.asarray(R_obs, dtype=float), np.asarray(M_obs, dtype=float),
+                                              np.asarray(V_obs, dtype=float))
+    v, tau = np.broadcast_to(v_est, R_obs.shape), np.broadcast_to(tau_est, R_obs.shape)
+    
+    # Inputs moved by a guard have zero derivative
+    R_free = (R_obs >= 0.001) & (R_obs <= 0.999)
+    V_free = V_obs > 0
+    R = np.clip(R_obs, 0.001, 0.999)
+    V = np.where(V_free, V_obs, 1e-10)
+    
+    L = np.log(R / (1 - R))
+    dL = 1 / (R * (1 - R))
+    
+    # v = sign(R - 0.5) * E^(1/4) with E = L * q / V and dq/dR = L * (2R - 1)
+    q = R**2 * L - R * L + R - 0.5
+    E = L * q / V
+    v_free = (E > 0) & (np.abs(v) > 1e-10)
+    E = np.where(v_free, E, 1.0)
+    dv_dR = np.where(v_free & R_free, v / (4 * E) * (dL * q + L**2 * (2*R - 1)) / V, 0.0)
+    dv_dV = np.where(v_free & V_free, -v / (4 * V), 0.0)
+    
+    # alpha = L / v
+    da_dR = np.where(R_free, dL / v, 0.0) - L / v**2 * dv_dR
+    da_dV = -L / v**2 * dv_dV
+    
+    # Since v * alpha = L, tau = M - k / v^2 with k = L (2R - 1) / 2
+    k = L * (2*R - 1) / 2
+    dk = np.where(R_free, (dL * (2*R - 1) + 2*L) / 2, 0.0)
+    tau_free = tau > 0
+    dt_dR = np.where(tau_free, -dk / v**2 + 2 * k / v**3 * dv_dR, 0.0)
+    dt_dV = np.where(tau_free, 2 * k / v**3 * dv_dV, 0.0)
+    
+    jacobian = np.zeros(R_obs.shape + (3, 3))
+    jacobian[..., 0, 0] = dv_dR
+    jacobian[..., 0, 2] = dv_dV
+    jacobian[..., 1, 0] = da_dR
+    jacobian[..., 1, 2] = da_dV
+    jacobian[..., 2, 0] = dt_dR
+    jacobian[..., 2, 1] = np.where(tau_free, 1.0, 0.0)
+    jacobian[..., 2, 2] = dt_dV
+    
+    return v_est, alpha_est, tau_est, jacobian
+
+class ForwardCache:
+    """
+    Size-bounded LRU cache of forward_ez predictions keyed by (v, alpha, tau).
+    
+    Its only consumer in this package is simulate_and_recover(cache=...),
+    for design points simulated repeatedly one at a time (several N values
+    per point, fixed fits). A hit costs under a microsecond, against about
+    2 for a scalar forward_ez call and 40 for forward_ez_jacobian. Arrays
+    should go straight to forward_ez instead, whose vectorized pass is
+    faster than any per-key lookup. With jacobian=True the entries also
+    hold the forward_ez_jacobian matrices, which are returned read-only
+    since every later hit shares them.
+    """
+    
+    def __init__(self, maxsize=100000, jacobian=False):
+        """
+        Parameters:
+        maxsize (int): Maximum number of cached triples
+        jacobian (bool): Also cache (and return) the forward Jacobians
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+        
+        self.maxsize = maxsize
+        self.jacobian = jacobian
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __call__(self, v, alpha, tau):
+        """
+        Return the forward predictions of a single triple.
+        
+        Returns:
+        tuple: (R_pred, M_pred, V_pred), plus the (3, 3) Jacobian if jacobian is True
+        """
+        key = (float(v), float(alpha), float(tau))
+        entry = self._entries.get(key)
+        
+        if entry is None:
+            self.misses += 1
+            entry = forward_ez_jacobian(*key) if self.jacobian else forward_ez(*key)
+            if self.jacobian:
+                entry[3].flags.writeable = False
+            self._insert(key, entry)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        
+        return entry
+    
+    def cache_info(self):
+        """
+        Return the hit and miss counts and the current and maximum size.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'maxsize': self.maxsize}
+    
+    def clear(self):
+        """
+        Remove every entry and reset the counters.
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+    
+    def _insert(self, key, entry):
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
 def simulate_observed_stats(R_pred, M_pred, V_pred, N):
     """
     Simulate observed summary statistics from predicted ones.
@@ -92,10 +379,16 @@ def simulate_observed_stats(R_pred, M_pred, V_pred, N):
     Returns:
     tuple: (R_obs, M_obs, V_obs) - observed accuracy, mean RT, and variance of RT
     """
+    if instrumentation.enabled:
+        instrumentation.count('sampler_R_clipped', int(R_pred < 0.001 or R_pred > 0.999))
+        instrumentation.count('sampler_V_floored', int(V_pred < 1e-10))
+    
     # Ensure parameters are valid
     R_pred = np.clip(R_pred, 0.001, 0.999)  # Constrain to valid probability range
     V_pred = max(V_pred, 1e-10)  # Ensure variance is positive
     
+    stats = _scipy_stats()
+    
     # Equation 7: Simulating observed number of correct trials
     T_obs = stats.binom.rvs(n=N, p=R_pred)
     R_obs = T_obs / N
@@ -110,13 +403,16 @@ def simulate_observed_stats(R_pred, M_pred, V_pred, N):
     except:
         # Fallback to a reasonable approximation if gamma sampling fails
         V_obs = V_pred * np.random.uniform(0.5, 1.5)
+        instrumentation.count('gamma_fallback')
     
     # Ensure variance is positive
+    if instrumentation.enabled:
+        instrumentation.count('sampler_V_floored', int(V_obs < 1e-10))
     V_obs = max(V_obs, 1e-10)
     
     return R_obs, M_obs, V_obs
 
-def simulate_and_recover(v, alpha, tau, N):
+def simulate_and_recover(v, alpha, tau, N, cache=None):
     """
     Simulate data from true parameters and recover the parameters.
     
@@ -125,6 +421,7 @@ def simulate_and_recover(v, alpha, tau, N):
     alpha (float): True boundary separation
     tau (float): True non-decision time
     N (int): Sample size
+    cache (ForwardCache): Optional cache of the forward predictions
     
     Returns:
     tuple: (v_est, alpha_est, tau_est, bias, squared_error) - estimated parameters and error metrics
@@ -134,19 +431,26 @@ def simulate_and_recover(v, alpha, tau, N):
     
     try:
         # Generate predicted summary statistics
-        R_pred, M_pred, V_pred = forward_ez(v, alpha, tau)
+        with instrumentation.stage('forward'):
+            if cache is None:
+                R_pred, M_pred, V_pred = forward_ez(v, alpha, tau)
+            else:
+                R_pred, M_pred, V_pred = cache(v, alpha, tau)[:3]
         
         # Simulate observed summary statistics
-        R_obs, M_obs, V_obs = simulate_observed_stats(R_pred, M_pred, V_pred, N)
+        with instrumentation.stage('sampling'):
+            R_obs, M_obs, V_obs = simulate_observed_stats(R_pred, M_pred, V_pred, N)
         
         # Recover parameters from observed statistics
-        v_est, alpha_est, tau_est = inverse_ez(R_obs, M_obs, V_obs)
+        with instrumentation.stage('inverse'):
+            v_est, alpha_est, tau_est = inverse_ez(R_obs, M_obs, V_obs)
         
         # For very small N, sometimes we get unrealistic parameter estimates
         # Apply some constraints based on the known valid ranges
-        v_est = np.clip(v_est, 0.1, 5.0)
-        alpha_est = np.clip(alpha_est, 0.1, 5.0)
-        tau_est = np.clip(tau_est, 0.01, 1.0)
+        with instrumentation.stage('clipping'):
+            v_est = np.clip(v_est, 0.1, 5.0)
+            alpha_est = np.clip(alpha_est, 0.1, 5.0)
+            tau_est = np.clip(tau_est, 0.01, 1.0)
         
         est_params = (v_est, alpha_est, tau_est)
         
@@ -158,10 +462,130 @@ def simulate_and_recover(v, alpha, tau, N):
         # If anything goes wrong, return default values that are reasonable
         # This prevents NaN propagation in the results
         print(f"Error in simulate_and_recover: {e}")
+        instrumentation.count('simulate_and_recover_errors')
         v_est = v
         alpha_est = alpha
         tau_est = tau
         bias = np.array([0.0, 0.0, 0.0])
         squared_error = 0.0
     
-    return v_est, alpha_est, tau_est, bias, squared_error
\ No newline at end of file
+    return v_est, alpha_est, tau_est, bias, squared_error
+
+def simulate_observed_stats_batch(R_pred, M_pred, V_pred, N, rng=None):
+    """
+    Simulate observed summary statistics for a whole batch of predictions.
+    
+    Draws every binomial, normal and gamma variate in one call each from a
+    numpy.random.Generator, following the same distributions (Eqs. 7-9) as
+    simulate_observed_stats.
+    
+    Parameters:
+    R_pred (array): Predicted accuracy rates
+    M_pred (array): Predicted mean RTs
+    V_pred (array): Predicted variances of RT
+    N (int or array): Sample size(s), broadcast against the predictions
+    rng (Generator, int or None): Random generator or seed
+    
+    Returns:
+    tuple: (R_obs, M_obs, V_obs) - arrays of observed accuracy, mean RT, and variance of RT
+    """
+    rng = np.random.default_rng(rng)
+    
+    if instrumentation.enabled:
+        R_raw = np.asarray(R_pred)
+        instrumentation.count('sampler_R_clipped', np.count_nonzero((R_raw < 0.001) | (R_raw > 0.999)))
+        instrumentation.count('sampler_V_floored', np.count_nonzero(np.asarray(V_pred) < 1e-10))
+    
+    # Ensure parameters are valid
+    R_pred, M_pred, V_pred, N = np.broadcast_arrays(
+        np.clip(R_pred, 0.001, 0.999),  # Constrain to valid probability range
+        M_pred,
+        np.maximum(V_pred, 1e-10),  # Ensure variance is positive
+        N,
+    )
+    
+    # Integral float sample sizes (e.g. 40.0) are accepted, as by simulate_observed_stats
+    if not np.issubdtype(N.dtype, np.integer):
+        whole = np.isfinite(N) & (N == np.round(N))
+        if not np.all(whole):
+            raise ValueError(f"Sample sizes N must be whole numbers, got {N[~whole].flat[0]}")
+        N = N.astype(np.int64)
+    
+    # Equation 7: Simulating observed number of correct trials
+    T_obs = rng.binomial(N, R_pred)
+    R_obs = T_obs / N
+    
+    # Equation 8: Simulating observed mean RT
+    M_obs = rng.normal(loc=M_pred, scale=np.sqrt(V_pred / N))
+    
+    # Equation 9: Simulating observed variance of RT
+    # The gamma shape (N-1)/2 is degenerate for N <= 1, so those entries use
+    # the same fallback approximation as simulate_observed_stats
+    degenerate = N <= 1
+    shape = np.where(degenerate, 1.0, (N - 1) / 2)
+    V_obs = rng.gamma(shape, scale=V_pred / shape)
+    if np.any(degenerate):
+        if instrumentation.enabled:
+            instrumentation.count('gamma_fallback', np.count_nonzero(degenerate))
+        fallback = V_pred * rng.uniform(0.5, 1.5, size=V_pred.shape)
+        V_obs = np.where(degenerate, fallback, V_obs)
+    
+    # Ensure variance is positive
+    if instrumentation.enabled:
+        instrumentation.count('sampler_V_floored', np.count_nonzero(V_obs < 1e-10))
+    V_obs = np.maximum(V_obs, 1e-10)
+    
+    return _as_output(R_obs), _as_output(M_obs), _as_output(V_obs)
+
+def simulate_and_recover_batch(v, alpha, tau, N, rng=None, predictions=None, inverse=inverse_ez):
+    """
+    Simulate data from a batch of true parameters and recover them.
+    
+    Vectorized counterpart of simulate_and_recover: the forward equations,
+    sampling, inverse equations and clipping all run once over the arrays.
+    
+    Parameters:
+    v (array): True drift rates
+    alpha (array): True boundary separations
+    tau (array): True non-decision times
+    N (int or array): Sample size(s)
+    rng (Generator, int or None): Random generator or seed
+    predictions (tuple): (R_pred, M_pred, V_pred) already computed for these
+    parameters (e.g. once per distinct design point), which skips the forward pass
+    inverse (callable): Inverse used for the recovery, inverse_ez or a drop-in
+    approximation such as an InverseLookupTable
+    
+    Returns:
+    tuple: (v_est, alpha_est, tau_est, bias, squared_error) - estimated parameters,
+    biases with a trailing axis of length 3 (v, alpha, tau), and squared errors
+    """
+    v, alpha, tau = np.broadcast_arrays(
+        np.asarray(v, dtype=float), np.asarray(alpha, dtype=float), np.asarray(tau, dtype=float)
+    )
+    
+    # Generate predicted summary statistics
+    with instrumentation.stage('forward'):
+        if predictions is None:
+            R_pred, M_pred, V_pred = forward_ez(v, alpha, tau)
+        else:
+            R_pred, M_pred, V_pred = predictions
+    
+    # Simulate observed summary statistics
+    with instrumentation.stage('sampling'):
+        R_obs, M_obs, V_obs = simulate_observed_stats_batch(R_pred, M_pred, V_pred, N, rng)
+    
+    # Recover parameters from observed statistics
+    with instrumentation.stage('inverse'):
+        v_est, alpha_est, tau_est = inverse(R_obs, M_obs, V_obs)
+    
+    # Apply the same constraints as simulate_and_recover
+    with instrumentation.stage('clipping'):
+        v_est = np.clip(v_est, 0.1, 5.0)
+        alpha_est = np.clip(alpha_est, 0.1, 5.0)
+        tau_est = np.clip(tau_est, 0.01, 1.0)
+    
+    # Calculate bias and squared error
+    bias = np.stack([v - v_est, alpha - alpha_est, tau - tau_est], axis=-1)
+    squared_error = np.sum(bias**2, axis=-1)
+    
+    return v_est, alpha_est, tau_est, bias, squared_error
@@ -2,24 +2,114 @@
 
 import sys
 import os
+import json
+import time
 import numpy as np
 import random
-import scipy.stats as stats
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import from the correct module
-from src.simulate_and_recover import forward_ez, inverse_ez, simulate_observed_stats, simulate_and_recover
+from src.simulate_and_recover import (forward_ez, inverse_ez, simulate_observed_stats, simulate_and_recover,
+                                      simulate_and_recover_batch)
+from src.running_stats import RunningStats
+from src.compact import CompactBatch
+from src.instrumentation import instrumentation
 
-def run_simulation(iterations=1000, N_values=[10, 40, 4000], seed=None):
+# Ranges the true parameters are drawn from (uniformly)
+PARAMETER_RANGES = {'v': (0.5, 2.0), 'alpha': (0.5, 2.0), 'tau': (0.1, 0.5)}
+
+# Per-iteration columns of the detailed results files, in file order
+RESULT_COLUMNS = ('v_true', 'alpha_true', 'tau_true', 'v_est', 'alpha_est', 'tau_est',
+                  'bias_v', 'bias_alpha', 'bias_tau', 'squared_error')
+
+# Number of iterations simulated together by the chunked engine
+DEFAULT_CHUNK_SIZE = 10000
+
+def run_simulation(iterations=1000, N_values=[10, 40, 4000], seed=None, workers=None,
+                   chunk_size=DEFAULT_CHUNK_SIZE, ranges=None, keep_rows=True,
+                   checkpoint=None, checkpoint_every=1, resume=False, tolerance=None, time_budget=None,
+                   compact=False):
     """
     Run the simulation for different sample sizes.
     
+    With workers=None the original serial loop is used, one simulate_and_recover
+    call per iteration. Passing a number of workers switches to the chunked
+    engine: iterations are split into chunks of chunk_size, every chunk draws
+    from its own random stream spawned from a single SeedSequence, and the
+    chunks of all N values are spread across a process pool. Because the
+    streams are tied to (N, chunk) rather than to a worker, the results are
+    bit-identical for any number of workers (but differ from the serial loop).
+    
+    The chunked engine aggregates bias and squared error with running
+    (Welford-style) moments. With keep_rows=False it runs in streaming mode:
+    only those moments are kept, so memory stays bounded however large
+    iterations is, and the entries hold the summary values but no
+    per-iteration columns.
+    
+    The chunked engine can also checkpoint its progress: every
+    checkpoint_every completed chunks, the partial aggregates and the seed
+    entropy are written to the checkpoint file. Kept rows are written once
+    per chunk, to a file of their own in the '<checkpoint>.rows' directory,
+    so checkpointing costs the same however long the run has been going.
+    A run with resume=True and
+    the same arguments continues from the last checkpoint and produces results
+    identical to an uninterrupted run.
+    
+    Entries from the chunked engine also report the Monte Carlo standard
+    error of each average (se_bias_v, se_bias_alpha, se_bias_tau,
+    se_squared_error). Giving a tolerance or time_budget makes the run
+    adaptive: each N runs chunk by chunk and stops as soon as all four
+    standard errors are at most tolerance, its time budget is spent, or
+    iterations (now an upper bound) is reached.
+    
+    With compact=True the chunked engine runs each chunk through a
+    CompactBatch: float32 working arrays allocated once per process and
+    reused for every chunk, with per-iteration rows kept in float32. The
+    summaries are still accumulated in float64; see the README for the
+    accuracy compared with the float64 engine.
+    
     Parameters:
     iterations (int): Number of simulation iterations for each N
     N_values (list): List of sample sizes to test
     seed (int): Random seed for reproducibility
+    workers (int): Number of processes for the chunked engine (None for the serial loop)
+    chunk_size (int): Number of iterations per chunk in the chunked engine
+    ranges (dict): (low, high) bounds for 'v', 'alpha' and 'tau' (defaults to PARAMETER_RANGES)
+    keep_rows (bool): Keep per-iteration rows; False streams (uses the chunked engine, one worker by default)
+    checkpoint (str): Checkpoint file path (uses the chunked engine, one worker by default)
+    checkpoint_every (int): Number of completed chunks between checkpoints
+    resume (bool): Continue from the checkpoint file if it exists
+    tolerance (float): Target Monte Carlo standard error for adaptive stopping
+    time_budget (float): Maximum seconds spent on each N in adaptive mode
+    compact (bool): Use float32 preallocated buffers (uses the chunked engine, one worker by default)
+    
+    Returns:
+    dict: Results for each N value
+    """
+    ranges = {**PARAMETER_RANGES, **(ranges or {})}
+    
+    with instrumentation.stage('run_simulation'):
+        if (workers is not None or not keep_rows or checkpoint is not None
+                or tolerance is not None or time_budget is not None or compact):
+            results = _run_chunked(iterations, N_values, seed, workers or 1, chunk_size, ranges, keep_rows,
+                                   checkpoint, checkpoint_every, resume, tolerance, time_budget, compact)
+        else:
+            results = _run_serial(iterations, N_values, seed, ranges)
+    
+    # Iterations actually run (adaptive runs may stop early), for the throughput report
+    if instrumentation.enabled:
+        instrumentation.add_items('run_simulation', sum(
+            data.get('iterations', len(data.get('squared_errors', ()))) for data in results.values()))
+    
+    return results
+
+def _run_serial(iterations, N_values, seed, ranges):
+    """
+    Run the original serial loop, one simulate_and_recover call per iteration.
     
     Returns:
     dict: Results for each N value
@@ -49,9 +139,9 @@ def run_simulation(iterations=1000, N_values=[10, 40, 4000], seed=None):
                 print(f"  Iteration {i + 1}/{iterations}")
             
             # Generate random parameters within the specified ranges
-            v = random.uniform(0.5, 2.0)
-            alpha = random.uniform(0.5, 2.0) 
-            tau = random.uniform(0.1, 0.5)
+            v = random.uniform(*ranges['v'])
+            alpha = random.uniform(*ranges['alpha'])
+            tau = random.uniform(*ranges['tau'])
             
             # Simulate and recover
             try:
@@ -73,65 +163,633 @@ def run_simulation(iterations=1000, N_values=[10, 40, 4000], seed=None):
                 # Continue with next iteration
                 continue
         
-        # Calculate average bias and squared error
-        avg_bias = np.mean(biases, axis=0)
-        avg_squared_error = np.mean(squared_errors)
-        
         # Store results for this N
-        results[N] = {
-            'v_true': v_true,
-            'alpha_true': alpha_true,
-            'tau_true': tau_true,
-            'v_est': v_est,
-            'alpha_est': alpha_est,
-            'tau_est': tau_est,
-            'biases': biases,
-            'squared_errors': squared_errors,
-            'avg_bias_v': avg_bias[0],
-            'avg_bias_alpha': avg_bias[1],
-            'avg_bias_tau': avg_bias[2],
-            'avg_squared_error': avg_squared_error
+        results[N] = _result_entry(N, v_true, alpha_true, tau_true, v_est, alpha_est, tau_est,
+                                   biases, squared_errors)
+    
+    return results
+
+def _result_entry(N, v_true, alpha_true, tau_true, v_est, alpha_est, tau_est, biases, squared_errors):
+    """
+    Build the results entry for one N value and report its averages.
+    """
+    # Calculate average bias and squared error
+    avg_bias = np.mean(biases, axis=0)
+    avg_squared_error = np.mean(squared_errors)
+    
+    entry = {
+        'v_true': v_true,
+        'alpha_true': alpha_true,
+        'tau_true': tau_true,
+        'v_est': v_est,
+        'alpha_est': alpha_est,
+        'tau_est': tau_est,
+        'biases': biases,
+        'squared_errors': squared_errors
+    }
+    entry.update(_summary_entry(N, avg_bias, avg_squared_error))
+    
+    return entry
+
+def _summary_entry(N, avg_bias, avg_squared_error):
+    """
+    Build and report the summary part of a results entry.
+    """
+    print(f"  Average bias for N = {N}: v = {avg_bias[0]:.4f}, alpha = {avg_bias[1]:.4f}, tau = {avg_bias[2]:.4f}")
+    print(f"  Average squared error for N = {N}: {avg_squared_error:.4f}")
+    
+    return {
+        'avg_bias_v': avg_bias[0],
+        'avg_bias_alpha': avg_bias[1],
+        'avg_bias_tau': avg_bias[2],
+        'avg_squared_error': avg_squared_error
+    }
+
+def chunk_seed(root, N, chunk_index):
+    """
+    Return the SeedSequence for one chunk of one N value.
+    
+    Equivalent to root.spawn() keyed by (N, chunk_index), without mutating
+    root. Every caller of the chunked engine (run_simulation, the sweep
+    service) derives its chunk streams this way, so the same seed gives the
+    same results whoever runs the chunks.
+    
+    Parameters:
+    root (SeedSequence): Root seed of the run
+    N (int): Sample size
+    chunk_index (int): Position of the chunk within the N value's iterations
+    
+    Returns:
+    SeedSequence: Seed for the chunk's random stream
+    """
+    return np.random.SeedSequence(root.entropy, spawn_key=root.spawn_key + (int(N), chunk_index))
+
+def chunk_sizes(iterations, chunk_size):
+    """
+    Split a number of iterations into chunk sizes.
+    
+    Parameters:
+    iterations (int): Total number of iterations for one N value
+    chunk_size (int): Largest number of iterations per chunk
+    
+    Returns:
+    list: Size of each chunk, all chunk_size except possibly the last
+    """
+    return [min(chunk_size, iterations - start) for start in range(0, iterations, chunk_size)]
+
+# Buffers reused by every compact chunk simulated in this process
+_compact_batch = None
+
+def simulate_chunk(N, size, seed_seq, ranges, keep_rows=True, compact=False):
+    """
+    Simulate and recover one chunk of iterations for a single N.
+    
+    This is the unit of work of the chunked engine; it can run in any
+    process. Merging the returned moments of chunks seeded with chunk_seed,
+    in chunk order, gives the summaries of run_simulation.
+    
+    Parameters:
+    N (int): Sample size
+    size (int): Number of iterations in the chunk
+    seed_seq (SeedSequence): Seed for this chunk's random stream
+    ranges (dict): (low, high) bounds for 'v', 'alpha' and 'tau'
+    keep_rows (bool): Whether to return the per-iteration arrays
+    compact (bool): Run the chunk in float32 through the process's CompactBatch
+    
+    Returns:
+    tuple: (moments, rows) - RunningStats of (bias_v, bias_alpha, bias_tau, squared_error)
+    and a dict of per-iteration arrays (None if keep_rows is False)
+    """
+    rng = np.random.default_rng(seed_seq)
+    
+    if compact:
+        return _simulate_compact_chunk(N, size, rng, ranges, keep_rows)
+    
+    # Generate random parameters within the specified ranges
+    v = rng.uniform(*ranges['v'], size)
+    alpha = rng.uniform(*ranges['alpha'], size)
+    tau = rng.uniform(*ranges['tau'], size)
+    
+    v_e, alpha_e, tau_e, bias, squared_error = simulate_and_recover_batch(v, alpha, tau, N, rng)
+    
+    moments = RunningStats(4)
+    moments.update(np.column_stack([bias, squared_error]))
+    
+    if not keep_rows:
+        return moments, None
+    
+    rows = {
+        'v_true': v,
+        'alpha_true': alpha,
+        'tau_true': tau,
+        'v_est': v_e,
+        'alpha_est': alpha_e,
+        'tau_est': tau_e,
+        'biases': bias,
+        'squared_errors': squared_error
+    }
+    return moments, rows
+
+def _simulate_compact_chunk(N, size, rng, ranges, keep_rows):
+    """
+    Simulate one chunk in the reusable float32 buffers (see simulate_chunk).
+    """
+    global _compact_batch
+    if _compact_batch is None or _compact_batch.size < size:
+        _compact_batch = CompactBatch(size)
+    
+    params, estimates, errors = _compact_batch.run(size, N, ranges, rng)
+    
+    moments = RunningStats(4)
+    moments.update(errors.T)
+    
+    if not keep_rows:
+        return moments, None
+    
+    # Copy the rows out, since the buffers are overwritten by the next chunk
+    rows = {key: row.copy() for key, row in zip(_ROW_KEYS, [*params, *estimates])}
+    rows['biases'] = errors[:3].T.copy()
+    rows['squared_errors'] = errors[3].copy()
+    return moments, rows
+
+def _simulate_task(task):
+    """
+    Unpack a (N, size, seed_seq, ranges, keep_rows, compact) task for simulate_chunk.
+    """
+    return simulate_chunk(*task)
+
+def _run_chunked(iterations, N_values, seed, workers, chunk_size, ranges, keep_rows=True,
+                 checkpoint=None, checkpoint_every=1, resume=False, tolerance=None, time_budget=None,
+                 compact=False):
+    """
+    Run the chunked engine, optionally across a process pool.
+    
+    Chunks are folded into the per-N aggregates in order. When a checkpoint
+    path is given, the aggregates are written there every checkpoint_every
+    completed chunks, together with the run configuration and the root
+    SeedSequence entropy; kept rows go to one file per chunk, written as the
+    chunk completes (see _save_chunk_rows). Every chunk's random stream is derived
+    from that entropy and its (N, chunk) index, so the entropy plus the
+    number of completed chunks is the full RNG state needed to resume.
+    
+    With a tolerance or time budget, each N is run adaptively: chunks are
+    dispatched in waves of one per worker and the stopping rule is checked
+    after every chunk, in chunk order, so the stopping point (and the
+    results) do not depend on the number of workers.
+    
+    When rows are kept and several workers run, the rows are not sent back
+    through the pool: each worker writes its chunk straight into a
+    shared-memory table of rows in RESULT_COLUMNS order (float32 when
+    compact, float64 otherwise), and the results entries are views of that
+    table (see _SharedRows). The segment's name is removed once the pool is
+    done; the memory itself is released with the last view.
+    
+    Returns:
+    dict: Results for each N value, with NumPy arrays in place of lists
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    if checkpoint_every < 1:
+        raise ValueError(f"checkpoint_every must be at least 1, got {checkpoint_every}")
+    
+    root = np.random.SeedSequence(seed)
+    sizes = chunk_sizes(iterations, chunk_size)
+    adaptive = tolerance is not None or time_budget is not None
+    
+    config = {
+        'entropy': root.entropy,
+        'iterations': iterations,
+        'N_values': [int(N) for N in N_values],
+        'chunk_size': chunk_size,
+        'ranges': {name: [float(bound) for bound in bounds] for name, bounds in ranges.items()},
+        'keep_rows': bool(keep_rows),
+        'tolerance': tolerance,
+        'compact': bool(compact)
+    }
+    state = {N: _new_state() for N in N_values}
+    
+    if resume and checkpoint is not None and os.path.exists(checkpoint):
+        config, state = _load_checkpoint(checkpoint, config, adopt_entropy=seed is None)
+        root = np.random.SeedSequence(config['entropy'])
+        done = sum(state[N]['chunks'] for N in N_values)
+        print(f"Resuming from {checkpoint}: {done}/{len(sizes) * len(N_values)} chunks already completed")
+    
+    completed = 0
+    started = None
+    
+    def record(N, chunk):
+        nonlocal completed
+        chunk_moments, rows = chunk
+        N_state = state[N]
+        index = N_state['chunks']
+        N_state['chunks'] += 1
+        N_state['moments'].merge(chunk_moments)
+        if rows is not None:
+            N_state['parts'].append(rows)
+        
+        # The stopping rule is applied before checkpointing, so a checkpoint
+        # never shows a converged N as still running
+        if adaptive:
+            moments = N_state['moments']
+            converged = (tolerance is not None and moments.count > 1
+                         and np.all(moments.standard_error <= tolerance))
+            out_of_time = time_budget is not None and time.perf_counter() - started >= time_budget
+            N_state['stopped'] = bool(converged or out_of_time)
+        
+        # Rows are saved before any checkpoint that counts their chunk
+        if checkpoint is not None and keep_rows:
+            if rows is None:
+                first = index * chunk_size
+                rows = _table_rows(N_state['table'][:, first:first + sizes[index]], sizes[index])
+            _save_chunk_rows(checkpoint, N, index, rows)
+        
+        completed += 1
+        if checkpoint is not None and completed % checkpoint_every == 0:
+            _save_checkpoint(checkpoint, config, state)
+    
+    def task(N, c):
+        chunk_task = (N, sizes[c], chunk_seed(root, N, c), ranges, keep_rows, compact)
+        if shared is None:
+            return chunk_task
+        return chunk_task + ((shared.segment.name, shape, dtype, N_values.index(N), c * chunk_size),)
+    
+    # Compact runs keep their rows in float32, in shared memory as well
+    dtype = np.dtype(np.float32 if compact else float)
+    shared = None
+    if keep_rows and workers > 1:
+        shape = (len(N_values), len(RESULT_COLUMNS), iterations)
+        shared = _SharedRows(shape, dtype)
+    
+    executor = None
+    
+    # Everything after the segment is created runs under the finally that unlinks it
+    try:
+        if shared is not None:
+            table = np.asarray(shared)
+            for i, N in enumerate(N_values):
+                N_state = state[N]
+                N_state['table'] = table[i]
+                if N_state['parts']:
+                    _write_rows(N_state['table'], 0, _concatenate_parts(N_state['parts']))
+                    N_state['parts'] = []
+        
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        run_tasks = executor.map if executor is not None else map
+        simulate_task = _simulate_task if shared is None else _simulate_shared_task
+        
+        if adaptive:
+            for N in N_values:
+                started = time.perf_counter()
+                
+                while not state[N]['stopped'] and state[N]['chunks'] < len(sizes):
+                    first = state[N]['chunks']
+                    wave = [task(N, c) for c in range(first, min(first + workers, len(sizes)))]
+                    
+                    for chunk in run_tasks(simulate_task, wave):
+                        record(N, chunk)
+                        if state[N]['stopped']:
+                            break
+        else:
+            tasks = [task(N, c) for N in N_values for c in range(state[N]['chunks'], len(sizes))]
+            for (N, *_), chunk in zip(tasks, run_tasks(simulate_task, tasks)):
+                record(N, chunk)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        
+        # The workers are done with the segment; the parent's mapping (and the
+        # views in the results) stay valid after the name is removed
+        if shared is not None:
+            shared.segment.unlink()
+    
+    if checkpoint is not None:
+        _save_checkpoint(checkpoint, config, state)
+    
+    return _collect_results(N_values, state, keep_rows)
+
+# Per-iteration arrays returned by simulate_chunk
+_ROW_KEYS = ('v_true', 'alpha_true', 'tau_true', 'v_est', 'alpha_est', 'tau_est', 'biases', 'squared_errors')
+
+class _SharedRows:
+    """
+    Owner of the shared-memory table the pool workers write their rows into.
+    
+    NumPy arrays built directly on a SharedMemory buffer do not keep the
+    segment alive, and closing it unmaps the memory under them. The table is
+    exposed through __array_interface__ instead, which makes this object the
+    base of np.asarray(owner) and so of every view of it: the segment is
+    closed by its own finalizer only once the last view is gone.
+    """
+    
+    def __init__(self, shape, dtype=float):
+        dtype = np.dtype(dtype)
+        self.segment = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+        self.__array_interface__ = np.ndarray(shape, dtype=dtype, buffer=self.segment.buf).__array_interface__
+
+def _simulate_shared_task(task):
+    """
+    Run a simulate_chunk task and write its rows into the shared table.
+    
+    The task is a _simulate_task tuple followed by (segment name, table shape,
+    table dtype, N index, first row); only the moments are sent back.
+    """
+    *chunk_task, (name, shape, dtype, index, offset) = task
+    moments, rows = simulate_chunk(*chunk_task)
+    
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        table = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+        _write_rows(table[index], offset, rows)
+        del table
+    finally:
+        segment.close()
+    
+    return moments, None
+
+def _write_rows(table, offset, rows):
+    """
+    Write a row dict into a (RESULT_COLUMNS, iterations) table starting at offset.
+    """
+    block = table[:, offset:offset + len(rows['squared_errors'])]
+    for i, key in enumerate(_ROW_KEYS[:6]):
+        block[i] = rows[key]
+    block[6:9] = np.asarray(rows['biases']).T
+    block[9] = rows['squared_errors']
+
+def _table_rows(table, count):
+    """
+    Return the first count rows of a (RESULT_COLUMNS, iterations) table as a row dict of views.
+    """
+    rows = {key: table[i, :count] for i, key in enumerate(_ROW_KEYS[:6])}
+    rows['biases'] = table[6:9, :count].T
+    rows['squared_errors'] = table[9, :count]
+    return rows
+
+def _new_state():
+    """
+    Return empty chunked-engine aggregates for one N value.
+    """
+    return {'chunks': 0, 'stopped': False, 'moments': RunningStats(4), 'parts': []}
+
+def _concatenate_parts(parts):
+    """
+    Concatenate per-chunk row dicts into a single row dict.
+    """
+    rows = {key: np.concatenate([part[key] for part in parts]) if parts else np.empty(0)
+            for key in _ROW_KEYS}
+    if not parts:
+        rows['biases'] = np.empty((0, 3))
+    return rows
+
+def _collect_results(N_values, state, keep_rows=True):
+    """
+    Turn the aggregates of each N value into results entries.
+    """
+    results = {}
+    
+    for N in N_values:
+        print(f"Results for N = {N}")
+        
+        moments = state[N]['moments']
+        standard_error = moments.standard_error
+        entry = {
+            'iterations': moments.count,
+            'se_bias_v': standard_error[0],
+            'se_bias_alpha': standard_error[1],
+            'se_bias_tau': standard_error[2],
+            'se_squared_error': standard_error[3]
         }
+        if 'table' in state[N]:
+            entry.update(_table_rows(state[N]['table'], moments.count))
+        elif keep_rows:
+            entry.update(_concatenate_parts(state[N]['parts']))
         
-        print(f"  Average bias for N = {N}: v = {avg_bias[0]:.4f}, alpha = {avg_bias[1]:.4f}, tau = {avg_bias[2]:.4f}")
-        print(f"  Average squared error for N = {N}: {avg_squared_error:.4f}")
+        # Without any iterations the averages are undefined, as in the serial loop
+        mean = moments.mean if moments.count else np.full(4, np.nan)
+        entry.update(_summary_entry(N, mean[:3], mean[3]))
+        results[N] = entry
     
     return results
 
-def save_results(results, output_dir):
+def _chunk_rows_path(checkpoint, N, chunk_index):
+    """
+    Return the file holding the rows of one chunk of a checkpointed run.
+    """
+    return os.path.join(f"{checkpoint}.rows", f"N{int(N)}_chunk{chunk_index}.npy")
+
+def _save_chunk_rows(checkpoint, N, chunk_index, rows):
+    """
+    Atomically write one chunk's rows as a (RESULT_COLUMNS, size) array in the rows' precision.
+    """
+    path = _chunk_rows_path(checkpoint, N, chunk_index)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    
+    size = len(rows['squared_errors'])
+    table = np.empty((len(RESULT_COLUMNS), size), dtype=np.asarray(rows['squared_errors']).dtype)
+    _write_rows(table, 0, rows)
+    
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        np.save(f, table)
+    os.replace(temp_path, path)
+
+def _save_checkpoint(path, config, state):
+    """
+    Atomically write the chunked-engine aggregates to a checkpoint file.
+    
+    Only the configuration and moments are written; the rows of each chunk
+    are already in their own file (see _save_chunk_rows).
+    """
+    arrays = {'config': np.array(json.dumps(config))}
+    
+    for N, N_state in state.items():
+        moments = N_state['moments']
+        arrays[f'chunks_{N}'] = np.array(N_state['chunks'])
+        arrays[f'stopped_{N}'] = np.array(N_state['stopped'])
+        arrays[f'count_{N}'] = np.array(moments.count)
+        arrays[f'mean_{N}'] = moments.mean
+        arrays[f'm2_{N}'] = moments.m2
+    
+    # Write to a temporary file first so an interruption never leaves a partial checkpoint
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(temp_path, path)
+
+def _load_checkpoint(path, config, adopt_entropy=False):
+    """
+    Load chunked-engine aggregates from a checkpoint file and its chunk rows.
+    
+    Parameters:
+    path (str): Checkpoint file
+    config (dict): Configuration of the run being resumed
+    adopt_entropy (bool): Take the seed entropy from the checkpoint (for runs without a seed)
+    
+    Returns:
+    tuple: (config, state) - the checkpoint's configuration and per-N aggregates
+    """
+    with np.load(path) as data:
+        saved = json.loads(str(data['config']))
+        if adopt_entropy:
+            config = {**config, 'entropy': saved['entropy']}
+        if saved != config:
+            raise ValueError(f"Checkpoint {path} was written by a run with a different configuration")
+        
+        state = {}
+        for N in config['N_values']:
+            N_state = _new_state()
+            N_state['chunks'] = int(data[f'chunks_{N}'])
+            N_state['stopped'] = bool(data[f'stopped_{N}'])
+            N_state['moments'].count = int(data[f'count_{N}'])
+            N_state['moments'].mean = data[f'mean_{N}']
+            N_state['moments'].m2 = data[f'm2_{N}']
+            
+            if config['keep_rows']:
+                for c in range(N_state['chunks']):
+                    table = np.load(_chunk_rows_path(path, N, c))
+                    N_state['parts'].append(_table_rows(table, table.shape[1]))
+            state[N] = N_state
+    
+    return saved, state
+
+def save_results(results, output_dir, format='txt'):
     """
     Save simulation results to files.
     
+    The summary is always written to summary.txt. Per-iteration rows are
+    written either as the original results_N*.txt text/CSV files
+    (format='txt') or as binary results_N*.npy files (format='npy'), which
+    hold the RESULT_COLUMNS as contiguous float64 rows of a (columns,
+    iterations) array and can be opened zero-copy with load_results.
+    
     Parameters:
     results (dict): Simulation results
     output_dir (str): Directory to save results
+    format (str): 'txt' or 'npy' for the per-iteration files
     """
+    if format not in ('txt', 'npy'):
+        raise ValueError(f"Unknown results format: {format!r}")
+    
     os.makedirs(output_dir, exist_ok=True)
     
     # Save summary statistics
-    with open(os.path.join(output_dir, 'summary.txt'), 'w') as f:
-        f.write("EZ Diffusion Model Simulation Results\n")
-        f.write("===================================\n\n")
-        
-        for N, data in results.items():
-            f.write(f"Sample size N = {N}\n")
-            f.write(f"Average bias for v: {data['avg_bias_v']:.6f}\n")
-            f.write(f"Average bias for alpha: {data['avg_bias_alpha']:.6f}\n")
-            f.write(f"Average bias for tau: {data['avg_bias_tau']:.6f}\n")
-            f.write(f"Average squared error: {data['avg_squared_error']:.6f}\n\n")
-    
-    # Save detailed results for each N
-    for N, data in results.items():
-        output_file = os.path.join(output_dir, f'results_N{N}.txt')
-        with open(output_file, 'w') as f:
-            f.write(f"Results for N = {N}\n")
-            f.write("Iteration,v_true,alpha_true,tau_true,v_est,alpha_est,tau_est,bias_v,bias_alpha,bias_tau,squared_error\n")
+    with instrumentation.stage('io'):
+        with open(os.path.join(output_dir, 'summary.txt'), 'w') as f:
+            f.write("EZ Diffusion Model Simulation Results\n")
+            f.write("===================================\n\n")
             
-            for i in range(len(data['v_true'])):
-                f.write(f"{i+1},{data['v_true'][i]:.6f},{data['alpha_true'][i]:.6f},{data['tau_true'][i]:.6f},")
-                f.write(f"{data['v_est'][i]:.6f},{data['alpha_est'][i]:.6f},{data['tau_est'][i]:.6f},")
-                f.write(f"{data['biases'][i][0]:.6f},{data['biases'][i][1]:.6f},{data['biases'][i][2]:.6f},")
-                f.write(f"{data['squared_errors'][i]:.6f}\n")
+            for N, data in results.items():
+                f.write(f"Sample size N = {N}\n")
+                f.write(f"Average bias for v: {data['avg_bias_v']:.6f}\n")
+                f.write(f"Average bias for alpha: {data['avg_bias_alpha']:.6f}\n")
+                f.write(f"Average bias for tau: {data['avg_bias_tau']:.6f}\n")
+                f.write(f"Average squared error: {data['avg_squared_error']:.6f}\n\n")
+    
+    # Save detailed results for each N (streaming runs keep no per-iteration rows)
+    for N, data in results.items():
+        if 'v_true' not in data:
+            continue
+        
+        columns = result_columns(data)
+        with instrumentation.stage('io'):
+            if format == 'npy':
+                _write_npy(os.path.join(output_dir, f'results_N{N}.npy'), columns)
+            else:
+                _write_text(os.path.join(output_dir, f'results_N{N}.txt'), N, columns)
+
+def result_columns(data):
+    """
+    Return the per-iteration columns of a results entry as float64 arrays.
+    
+    Used by every writer of per-iteration rows (save_results, ResultsStore).
+    Float64 array entries, such as those of the chunked engine, are returned
+    as views without copying.
+    
+    Parameters:
+    data (dict): One N value's entry from run_simulation, with rows kept
+    
+    Returns:
+    dict: Array for each name in RESULT_COLUMNS
+    """
+    biases = np.asarray(data['biases'], dtype=float).reshape(-1, 3)
+    
+    return {
+        'v_true': np.asarray(data['v_true'], dtype=float),
+        'alpha_true': np.asarray(data['alpha_true'], dtype=float),
+        'tau_true': np.asarray(data['tau_true'], dtype=float),
+        'v_est': np.asarray(data['v_est'], dtype=float),
+        'alpha_est': np.asarray(data['alpha_est'], dtype=float),
+        'tau_est': np.asarray(data['tau_est'], dtype=float),
+        'bias_v': biases[:, 0],
+        'bias_alpha': biases[:, 1],
+        'bias_tau': biases[:, 2],
+        'squared_error': np.asarray(data['squared_errors'], dtype=float)
+    }
+
+def _write_npy(output_file, columns):
+    """
+    Write per-iteration columns as a (columns, iterations) float64 .npy file.
+    
+    Produces the same file as np.save of the stacked columns, but writes each
+    column straight from its buffer, so contiguous float64 columns (such as
+    the shared-memory rows of a parallel run) are never copied.
+    """
+    shape = (len(RESULT_COLUMNS), len(columns[RESULT_COLUMNS[0]]))
+    
+    with open(output_file, 'wb') as f:
+        np.lib.format.write_array_header_1_0(f, {'descr': np.lib.format.dtype_to_descr(np.dtype(float)),
+                                                'fortran_order': False, 'shape': shape})
+        for name in RESULT_COLUMNS:
+            f.write(np.ascontiguousarray(columns[name], dtype=float).data)
+
+def _write_text(output_file, N, columns):
+    """
+    Write per-iteration columns in the results_N*.txt text/CSV format.
+    """
+    with open(output_file, 'w') as f:
+        f.write(f"Results for N = {N}\n")
+        f.write("Iteration," + ",".join(RESULT_COLUMNS) + "\n")
+        
+        rows = zip(*(columns[name] for name in RESULT_COLUMNS))
+        for i, row in enumerate(rows, start=1):
+            f.write(f"{i}," + ",".join(f"{value:.6f}" for value in row) + "\n")
+
+def load_results(output_dir, mmap=True):
+    """
+    Load binary per-iteration results written by save_results(format='npy').
+    
+    Parameters:
+    output_dir (str): Directory containing results_N*.npy files
+    mmap (bool): Memory-map the files read-only instead of reading them into memory
+    
+    Returns:
+    dict: For each N, a dict mapping each name in RESULT_COLUMNS to a 1-D array
+    (zero-copy views of the memory-mapped file when mmap is True)
+    """
+    results = {}
+    
+    for name in os.listdir(output_dir):
+        if not (name.startswith('results_N') and name.endswith('.npy')):
+            continue
+        
+        N = int(name[len('results_N'):-len('.npy')])
+        table = np.load(os.path.join(output_dir, name), mmap_mode='r' if mmap else None)
+        results[N] = {column: table[i] for i, column in enumerate(RESULT_COLUMNS)}
+    
+    return dict(sorted(results.items()))
+
+def export_text(output_dir):
+    """
+    Export binary results_N*.npy files in output_dir as results_N*.txt files.
+    
+    Parameters:
+    output_dir (str): Directory containing results_N*.npy files
+    """
+    for N, columns in load_results(output_dir).items():
+        _write_text(os.path.join(output_dir, f'results_N{N}.txt'), N, columns)
 
 def main():
     """
@@ -0,0 +1,245 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+import json
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.simulate_and_recover import forward_ez, simulate_and_recover_batch
+from src.simulation_main import PARAMETER_RANGES
+
+# Default number of simulated cells (design points x replicates) per shard
+DEFAULT_SHARD_SIZE = 1000000
+
+class GridDesign:
+    """
+    Full Cartesian product of v, alpha, tau and N values.
+    
+    Points are numbered in C order over (v, alpha, tau, N), so N varies
+    fastest and each parameter triple's N values are adjacent.
+    """
+    
+    kind = 'grid'
+    
+    def __init__(self, v, alpha, tau, N):
+        """
+        Parameters:
+        v, alpha, tau (array): Values of each parameter axis
+        N (array): Sample sizes
+        """
+        self.v = np.asarray(v, dtype=float)
+        self.alpha = np.asarray(alpha, dtype=float)
+        self.tau = np.asarray(tau, dtype=float)
+        self.N = np.asarray(N, dtype=np.int64)
+    
+    @property
+    def shape(self):
+        return (len(self.v), len(self.alpha), len(self.tau), len(self.N))
+    
+    @property
+    def n_points(self):
+        return int(np.prod(self.shape))
+    
+    def points(self, start, stop):
+        """
+        Return the (v, alpha, tau, N) arrays of the points with flat indices in [start, stop).
+        """
+        i, j, k, n = np.unravel_index(np.arange(start, stop), self.shape)
+        return self.v[i], self.alpha[j], self.tau[k], self.N[n]
+    
+    def to_arrays(self):
+        return {'v': self.v, 'alpha': self.alpha, 'tau': self.tau, 'N': self.N}
+
+class SampledDesign:
+    """
+    Parameter triples drawn uniformly within ranges, each crossed with a set of N values.
+    """
+    
+    kind = 'sampled'
+    
+    def __init__(self, params, N):
+        """
+        Parameters:
+        params (array): (samples, 3) array of (v, alpha, tau) triples
+        N (array): Sample sizes
+        """
+        self.params = np.asarray(params, dtype=float).reshape(-1, 3)
+        self.N = np.asarray(N, dtype=np.int64)
+    
+    @classmethod
+    def uniform(cls, n_samples, N, ranges=None, seed=None):
+        """
+        Draw n_samples triples uniformly within ranges (defaults to PARAMETER_RANGES).
+        """
+        ranges = {**PARAMETER_RANGES, **(ranges or {})}
+        rng = np.random.default_rng(seed)
+        params = np.column_stack([rng.uniform(*ranges[name], n_samples) for name in ('v', 'alpha', 'tau')])
+        return cls(params, N)
+    
+    @property
+    def shape(self):
+        return (len(self.params), len(self.N))
+    
+    @property
+    def n_points(self):
+        return int(np.prod(self.shape))
+    
+    def points(self, start, stop):
+        """
+        Return the (v, alpha, tau, N) arrays of the points with flat indices in [start, stop).
+        """
+        sample, n = np.unravel_index(np.arange(start, stop), self.shape)
+        v, alpha, tau = self.params[sample].T
+        return v, alpha, tau, self.N[n]
+    
+    def to_arrays(self):
+        return {'params': self.params, 'N': self.N}
+
+DESIGNS = {design.kind: design for design in (GridDesign, SampledDesign)}
+
+def run_sweep(design, output_dir, replicates=100, shard_size=DEFAULT_SHARD_SIZE, workers=1, seed=None):
+    """
+    Simulate and recover every point of a design, writing one binary file per shard.
+    
+    The flat point range is split into shards of about shard_size simulated
+    cells. Each shard runs its points' replicates through
+    simulate_and_recover_batch with its own random stream (derived from the
+    seed and the shard index) and writes shard_<k>.npz with per-point mean
+    bias and mean squared error. Shards already present in output_dir are
+    skipped, so an interrupted sweep can simply be run again.
+    
+    Parameters:
+    design (GridDesign or SampledDesign): Points to simulate
+    output_dir (str): Directory for the manifest and shard files
+    replicates (int): Simulations per design point
+    shard_size (int): Approximate number of simulated cells per shard
+    workers (int): Number of processes
+    seed (int): Random seed
+    
+    Returns:
+    int: Number of shards in the sweep
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    shard_points = max(1, shard_size // replicates)
+    entropy = _write_manifest(output_dir, design, replicates, shard_points, seed)
+    
+    root = np.random.SeedSequence(entropy)
+    bounds = [(start, min(start + shard_points, design.n_points))
+              for start in range(0, design.n_points, shard_points)]
+    tasks = [(k, start, stop, replicates, np.random.SeedSequence(root.entropy, spawn_key=(k,)), output_dir)
+             for k, (start, stop) in enumerate(bounds)
+             if not os.path.exists(_shard_path(output_dir, k))]
+    
+    if workers == 1:
+        _init_worker(design)
+        for task in tasks:
+            _run_shard(task)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(design,)) as executor:
+            for _ in executor.map(_run_shard, tasks):
+                pass
+    
+    return len(bounds)
+
+# Design of the sweep running in this process (sent once per worker)
+_design = None
+
+def _init_worker(design):
+    global _design
+    _design = design
+
+def _shard_path(output_dir, k):
+    return os.path.join(output_dir, f'shard_{k:05d}.npz')
+
+def _run_shard(task):
+    """
+    Simulate one shard and write its per-point aggregates.
+    """
+    k, start, stop, replicates, seed_seq, output_dir = task
+    rng = np.random.default_rng(seed_seq)
+    
+    points = _design.points(start, stop)
+    
+    # N varies fastest, so the shard's points share their triples in runs of
+    # len(N): predict each distinct triple once, then repeat the predictions
+    # over its N values and replicates
+    triple = np.arange(start, stop) // _design.shape[-1]
+    _, first, inverse = np.unique(triple, return_index=True, return_inverse=True)
+    predictions = (np.repeat(x[inverse], replicates) for x in forward_ez(*(x[first] for x in points[:3])))
+    v, alpha, tau, N = (np.repeat(x, replicates) for x in points)
+    _, _, _, bias, squared_error = simulate_and_recover_batch(v, alpha, tau, N, rng, predictions=tuple(predictions))
+    
+    mean_bias = bias.reshape(stop - start, replicates, 3).mean(axis=1)
+    mean_squared_error = squared_error.reshape(stop - start, replicates).mean(axis=1)
+    
+    # Write to a temporary file first so a killed worker never leaves a partial shard
+    path = _shard_path(output_dir, k)
+    temp_path = f"{path}.tmp.npz"
+    np.savez(temp_path, start=start, stop=stop, mean_bias=mean_bias, mean_squared_error=mean_squared_error)
+    os.replace(temp_path, path)
+
+def _write_manifest(output_dir, design, replicates, shard_points, seed):
+    """
+    Write (or check) the sweep manifest and return the seed entropy to use.
+    """
+    path = os.path.join(output_dir, 'manifest.npz')
+    config = {'kind': design.kind, 'replicates': replicates, 'shard_points': shard_points}
+    
+    if os.path.exists(path):
+        with np.load(path) as data:
+            saved = json.loads(str(data['config']))
+            same_design = all(np.array_equal(data[name], values) for name, values in design.to_arrays().items())
+        entropy = int(saved.pop('entropy'))
+        if saved != config or not same_design or (seed is not None and seed != entropy):
+            raise ValueError(f"{output_dir} already holds a different sweep")
+        return entropy
+    
+    entropy = np.random.SeedSequence(seed).entropy
+    np.savez(path, config=np.array(json.dumps({**config, 'entropy': entropy})), **design.to_arrays())
+    return entropy
+
+def load_design(output_dir):
+    """
+    Load the design and replicate count recorded in a sweep's manifest.
+    
+    Returns:
+    tuple: (design, replicates)
+    """
+    with np.load(os.path.join(output_dir, 'manifest.npz')) as data:
+        config = json.loads(str(data['config']))
+        arrays = {name: data[name] for name in data.files if name != 'config'}
+    return DESIGNS[config['kind']](**arrays), config['replicates']
+
+def merge_shards(output_dir):
+    """
+    Combine a sweep's shard files into arrays shaped like the design.
+    
+    Parameters:
+    output_dir (str): Directory written by run_sweep
+    
+    Returns:
+    dict: 'mean_bias' with shape design.shape + (3,), 'mean_squared_error' with
+    shape design.shape (NaN for points whose shard is missing), and 'design'
+    """
+    design, replicates = load_design(output_dir)
+    mean_bias = np.full((design.n_points, 3), np.nan)
+    mean_squared_error = np.full(design.n_points, np.nan)
+    
+    for name in sorted(os.listdir(output_dir)):
+        if not (name.startswith('shard_') and name.endswith('.npz')) or name.endswith('.tmp.npz'):
+            continue
+        with np.load(os.path.join(output_dir, name)) as shard:
+            rows = slice(int(shard['start']), int(shard['stop']))
+            mean_bias[rows] = shard['mean_bias']
+            mean_squared_error[rows] = shard['mean_squared_error']
+    
+    return {
+        'design': design,
+        'replicates': replicates,
+        'mean_bias': mean_bias.reshape(design.shape + (3,)),
+        'mean_squared_error': mean_squared_error.reshape(design.shape)
+    }
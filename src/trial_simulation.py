@@ -0,0 +1,175 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.running_stats import merge_moments
+
+# Default Euler-Maruyama step (seconds) and cut-off for trials that never finish
+DEFAULT_DT = 1e-2
+DEFAULT_MAX_TIME = 10.0
+
+# Default number of (parameter set x trial) cells simulated at once
+DEFAULT_CHUNK_SIZE = 1000000
+
+def simulate_trials(v, alpha, tau, n_trials, dt=DEFAULT_DT, max_time=DEFAULT_MAX_TIME, bridge=True, rng=None):
+    """
+    Simulate individual trials of a Wiener diffusion process.
+    
+    Each trial starts halfway between the boundaries 0 and alpha and drifts
+    with rate v and unit diffusion (the scaling assumed by the EZ equations).
+    All (parameter set x trial) walks advance together with vectorized
+    Euler-Maruyama steps; walks that hit a boundary are masked out of the
+    active set, so later steps only touch trials that are still running.
+    
+    With bridge=True each step also checks whether the continuous path
+    crossed a boundary between two grid points (Brownian bridge correction),
+    which removes most of the discretization bias of a coarse dt. Crossings
+    are timed at the midpoint of the step in which they happen.
+    
+    Parameters:
+    v (array): Drift rates, one per parameter set
+    alpha (array): Boundary separations
+    tau (array): Non-decision times
+    n_trials (int): Number of trials per parameter set
+    dt (float): Time step in seconds
+    max_time (float): Decision time after which unfinished trials are abandoned
+    bridge (bool): Apply the Brownian bridge boundary-crossing correction
+    rng (Generator, int or None): Random generator or seed
+    
+    Returns:
+    tuple: (correct, rt) - (parameter sets, trials) arrays of choices (True for the
+    upper boundary) and response times (NaN for trials abandoned at max_time)
+    """
+    rng = np.random.default_rng(rng)
+    v, alpha, tau = (np.atleast_1d(np.asarray(x, dtype=float)) for x in np.broadcast_arrays(v, alpha, tau))
+    n_sets = len(v)
+    
+    correct = np.zeros((n_sets, n_trials), dtype=bool)
+    decision_time = np.full((n_sets, n_trials), np.nan)
+    
+    # Flat indices, positions and parameters of the walks still running
+    active = np.arange(n_sets * n_trials)
+    drift = np.repeat(v, n_trials)
+    bound = np.repeat(alpha, n_trials)
+    x = bound / 2
+    
+    sqrt_dt = np.sqrt(dt)
+    n_steps = int(np.ceil(max_time / dt))
+    
+    for step in range(1, n_steps + 1):
+        if len(active) == 0:
+            break
+        
+        x_next = x + drift * dt + sqrt_dt * rng.standard_normal(len(active))
+        upper = x_next >= bound
+        lower = x_next <= 0
+        
+        if bridge:
+            # Probability that the path touched a boundary between the two grid points
+            inside = ~(upper | lower)
+            p_upper = np.exp(-2 * (bound - x) * (bound - x_next) / dt)
+            p_lower = np.exp(-2 * x * x_next / dt)
+            u = rng.random(len(active))
+            upper |= inside & (u < p_upper)
+            lower |= inside & ~upper & (u < p_upper + p_lower)
+        
+        done = upper | lower
+        if np.any(done):
+            finished = active[done]
+            correct.flat[finished] = upper[done]
+            decision_time.flat[finished] = (step - 0.5) * dt
+            
+            keep = ~done
+            active, drift, bound, x_next = active[keep], drift[keep], bound[keep], x_next[keep]
+        
+        x = x_next
+    
+    return correct, decision_time + tau[:, None]
+
+def summarize_trials(correct, rt):
+    """
+    Compute EZ summary statistics from trial-level data.
+    
+    Parameters:
+    correct (array): (parameter sets, trials) array of choices
+    rt (array): (parameter sets, trials) array of response times (NaN for no response)
+    
+    Returns:
+    tuple: (R_obs, M_obs, V_obs, n) - accuracy, mean and sample variance of correct
+    RTs, and number of responded trials, for each parameter set
+    """
+    n, n_correct, mean, m2 = _trial_moments(correct, rt)
+    return _finalize(n, n_correct, mean, m2)
+
+def simulate_trial_stats(v, alpha, tau, n_trials, dt=DEFAULT_DT, max_time=DEFAULT_MAX_TIME, bridge=True,
+                         chunk_size=DEFAULT_CHUNK_SIZE, rng=None):
+    """
+    Simulate trials in memory-bounded chunks and return only their summary statistics.
+    
+    At most chunk_size (parameter set x trial) cells are simulated at once;
+    the per-set accuracy and correct-RT moments are merged across chunks, so
+    the result equals summarize_trials on the full trial arrays.
+    
+    Parameters:
+    v, alpha, tau (array): Parameters of each set, as for simulate_trials
+    n_trials (int): Number of trials per parameter set
+    dt, max_time, bridge: Stepping options, as for simulate_trials
+    chunk_size (int): Maximum number of cells simulated at once
+    rng (Generator, int or None): Random generator or seed
+    
+    Returns:
+    tuple: (R_obs, M_obs, V_obs, n) - as for summarize_trials, ready for inverse_ez
+    """
+    rng = np.random.default_rng(rng)
+    v, alpha, tau = (np.atleast_1d(np.asarray(x, dtype=float)) for x in np.broadcast_arrays(v, alpha, tau))
+    n_sets = len(v)
+    
+    set_block = max(1, min(n_sets, chunk_size))
+    trial_block = max(1, chunk_size // set_block)
+    
+    n = np.zeros(n_sets)
+    n_correct = np.zeros(n_sets)
+    mean = np.zeros(n_sets)
+    m2 = np.zeros(n_sets)
+    
+    for start in range(0, n_sets, set_block):
+        sets = slice(start, start + set_block)
+        for done in range(0, n_trials, trial_block):
+            correct, rt = simulate_trials(v[sets], alpha[sets], tau[sets], min(trial_block, n_trials - done),
+                                          dt, max_time, bridge, rng)
+            chunk_n, chunk_correct, chunk_mean, chunk_m2 = _trial_moments(correct, rt)
+            
+            n[sets] += chunk_n
+            count = n_correct[sets]
+            _, mean[sets], m2[sets] = merge_moments(count, mean[sets], m2[sets], chunk_correct, chunk_mean, chunk_m2)
+            n_correct[sets] = count + chunk_correct
+    
+    return _finalize(n, n_correct, mean, m2)
+
+def _trial_moments(correct, rt):
+    """
+    Per-set counts and correct-RT moments of a block of trials.
+    """
+    responded = ~np.isnan(rt)
+    hits = correct & responded
+    
+    n = np.sum(responded, axis=1).astype(float)
+    n_correct = np.sum(hits, axis=1).astype(float)
+    mean = np.sum(np.where(hits, rt, 0.0), axis=1) / np.maximum(n_correct, 1)
+    m2 = np.sum(np.where(hits, rt - mean[:, None], 0.0)**2, axis=1)
+    
+    return n, n_correct, mean, m2
+
+def _finalize(n, n_correct, mean, m2):
+    """
+    Turn counts and moments into (R_obs, M_obs, V_obs, n).
+    """
+    R_obs = n_correct / np.maximum(n, 1)
+    M_obs = np.where(n_correct > 0, mean, np.nan)
+    V_obs = np.where(n_correct > 1, m2 / np.maximum(n_correct - 1, 1), np.nan)
+    return R_obs, M_obs, V_obs, n
@@ -0,0 +1,47 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+import copy
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from src.benchmark import run_benchmarks, compare_to_baseline, baseline_path, BASELINE_DIR
+
+class TestBenchmark(unittest.TestCase):
+    def test_report_and_regression_check(self):
+        """Test that the benchmark report covers every stage and regressions are detected"""
+        report = run_benchmarks(batch_sizes=[100], N_values=[10, 40], sweep_iterations=200,
+                                scalar_calls=5, repeats=1)
+        
+        stages = {record['stage'] for record in report['records']}
+        self.assertEqual(stages, {'forward_ez', 'inverse_ez', 'simulate_observed_stats_batch',
+                                  'simulate_and_recover_batch', 'simulate_observed_stats',
+                                  'simulate_and_recover', 'run_simulation'})
+        for record in report['records']:
+            self.assertGreater(record['triples_per_second'], 0)
+            self.assertGreaterEqual(record['peak_memory_bytes'], 0)
+        self.assertIn('numpy', report['metadata'])
+        
+        # Against itself there are no regressions
+        self.assertEqual(compare_to_baseline(report, report), [])
+        
+        # A baseline twice as fast flags every case
+        faster = copy.deepcopy(report)
+        for record in faster['records']:
+            record['triples_per_second'] *= 2
+        regressions = compare_to_baseline(report, faster, tolerance=0.3)
+        self.assertEqual(len(regressions), len(report['records']))
+        self.assertAlmostEqual(regressions[0]['ratio'], 0.5)
+    
+    def test_baseline_per_machine(self):
+        """Test that each machine gets its own baseline file in the git-ignored directory"""
+        path = baseline_path('lab pc/2')
+        self.assertEqual(os.path.dirname(path), BASELINE_DIR)
+        self.assertEqual(os.path.basename(path), 'baseline_lab_pc_2.json')
+        self.assertNotEqual(baseline_path('other'), path)
+
+if __name__ == '__main__':
+    unittest.main()
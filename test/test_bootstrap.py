@@ -0,0 +1,63 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from src.simulate_and_recover import forward_ez, inverse_ez, simulate_observed_stats_batch
+from src.bootstrap import bootstrap_ez, delta_method_ez
+
+class TestBootstrap(unittest.TestCase):
+    def test_intervals_cover_true_parameters(self):
+        """Test the shape of the bootstrap output and the coverage of its intervals"""
+        rng = np.random.default_rng(0)
+        v = rng.uniform(0.5, 2.0, 300)
+        alpha = rng.uniform(0.5, 2.0, 300)
+        tau = rng.uniform(0.1, 0.5, 300)
+        R_obs, M_obs, V_obs = simulate_observed_stats_batch(*forward_ez(v, alpha, tau), 200, rng)
+        
+        results = bootstrap_ez(R_obs, M_obs, V_obs, 200, n_boot=500, rng=1, chunk_size=20000)
+        
+        np.testing.assert_allclose(results['v'], inverse_ez(R_obs, M_obs, V_obs)[0])
+        for name, true in [('v', v), ('alpha', alpha), ('tau', tau)]:
+            lower, upper = results[f'{name}_ci'].T
+            self.assertEqual(results[f'{name}_ci'].shape, (300, 2))
+            self.assertTrue(np.all(lower <= upper))
+            self.assertTrue(np.all(results[f'{name}_se'] > 0))
+            
+            coverage = np.mean((lower <= true) & (true <= upper))
+            self.assertGreater(coverage, 0.88)
+            self.assertLess(coverage, 0.99)
+    
+    def test_interval_width_shrinks_with_N(self):
+        """Test that more trials give narrower intervals, and scalars are accepted"""
+        R_pred, M_pred, V_pred = forward_ez(1.0, 1.0, 0.3)
+        small = bootstrap_ez(R_pred, M_pred, V_pred, 40, n_boot=1000, rng=2)
+        large = bootstrap_ez(R_pred, M_pred, V_pred, 4000, n_boot=1000, rng=2)
+        
+        self.assertEqual(small['v_ci'].shape, (1, 2))
+        for name in ['v', 'alpha', 'tau']:
+            self.assertLess(np.ptp(large[f'{name}_ci']), np.ptp(small[f'{name}_ci']))
+            self.assertTrue(large[f'{name}_ci'][0, 0] < large[name][0] < large[f'{name}_ci'][0, 1])
+    
+    def test_delta_method_matches_bootstrap(self):
+        """Test that delta-method standard errors agree with the bootstrap for moderate N"""
+        R_obs, M_obs, V_obs = forward_ez(np.array([1.0, 1.5]), np.array([1.0, 1.2]), np.array([0.3, 0.2]))
+        
+        delta = delta_method_ez(R_obs, M_obs, V_obs, 400)
+        boot = bootstrap_ez(R_obs, M_obs, V_obs, 400, n_boot=4000, rng=3)
+        
+        np.testing.assert_allclose(delta['v'], boot['v'])
+        for name in ['v', 'alpha', 'tau']:
+            self.assertEqual(delta[f'{name}_ci'].shape, (2, 2))
+            np.testing.assert_allclose(delta[f'{name}_se'], boot[f'{name}_se'], rtol=0.1)
+        
+        # A single trial leaves the variance of RT undefined
+        self.assertTrue(np.isnan(delta_method_ez(0.8, 0.5, 0.1, 1)['v_se'][0]))
+
+if __name__ == '__main__':
+    unittest.main()
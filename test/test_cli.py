@@ -0,0 +1,67 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import tempfile
+import unittest
+import subprocess
+import contextlib
+import numpy as np
+from src import cli
+from src.simulation_main import load_results
+
+CLI_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'cli.py')
+
+class TestCli(unittest.TestCase):
+    def test_help_skips_heavy_imports(self):
+        """Test that --help returns without importing NumPy or SciPy"""
+        code = ("import sys, runpy; sys.argv = [sys.argv[1], '--help']\n"
+                "try:\n    runpy.run_path(sys.argv[0], run_name='__main__')\n"
+                "except SystemExit:\n    pass\n"
+                "print('numpy' in sys.modules, 'scipy' in sys.modules)")
+        output = subprocess.run([sys.executable, '-c', code, CLI_PATH], capture_output=True, text=True,
+                                check=True).stdout
+        self.assertTrue(output.strip().endswith('False False'))
+    
+    def test_run_with_options(self):
+        """Test a run configured entirely from command-line flags"""
+        with tempfile.TemporaryDirectory() as output_dir:
+            with contextlib.redirect_stdout(io.StringIO()):
+                status = cli.main(['--iterations', '50', '--N-values', '10', '40', '--v-range', '1.0', '1.5',
+                                   '--seed', '3', '--workers', '1', '--format', 'npy', '--output-dir', output_dir])
+            
+            self.assertEqual(status, 0)
+            self.assertTrue(os.path.exists(os.path.join(output_dir, 'summary.txt')))
+            results = load_results(output_dir)
+            self.assertEqual(sorted(results), [10, 40])
+            self.assertEqual(len(results[40]['v_true']), 50)
+            self.assertTrue(np.all((results[40]['v_true'] >= 1.0) & (results[40]['v_true'] <= 1.5)))
+        
+        for argv in (['--format', 'csv'], ['--iterations', '0'], ['--workers', '-1'], ['--chunk-size', '100'],
+                     ['--workers', '2', '--chunk-size', '0']):
+            with contextlib.redirect_stderr(io.StringIO()) as stderr, self.assertRaises(SystemExit) as raised:
+                cli.main(argv)
+            self.assertEqual(raised.exception.code, 2)
+            self.assertIn('usage:', stderr.getvalue())
+    
+    def test_store_option(self):
+        """Test that --store appends the run to a results store"""
+        from src.results_store import ResultsStore
+        
+        with tempfile.TemporaryDirectory() as output_dir:
+            path = os.path.join(output_dir, 'results.db')
+            for _ in range(2):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    cli.main(['--iterations', '20', '--N-values', '10', '--workers', '1',
+                              '--output-dir', output_dir, '--store', path])
+            
+            with ResultsStore(path) as store:
+                self.assertEqual([run[3] for run in store.runs()], [20, 20])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import unittest
+import contextlib
+import numpy as np
+from src.compact import CompactBatch, compare_precision
+from src.simulate_and_recover import forward_ez, inverse_ez
+from src.simulation_main import run_simulation, PARAMETER_RANGES
+
+class TestCompactBatch(unittest.TestCase):
+    def test_equations_match_reference(self):
+        """Test the in-place equations against forward_ez and inverse_ez"""
+        rng = np.random.default_rng(0)
+        batch = CompactBatch(500, dtype=np.float64)
+        work = batch.work
+        work[0] = rng.uniform(0.5, 2.0, 500)
+        work[1] = rng.uniform(0.5, 2.0, 500)
+        work[2] = rng.uniform(0.1, 0.5, 500)
+        
+        batch._forward(*work[0:6], work[9])
+        np.testing.assert_allclose(work[3:6], np.stack(forward_ez(*work[0:3])), rtol=1e-12)
+        
+        # Perturbed statistics, including guarded values
+        observed = work[3:6] * np.array([[1.0], [1.05], [1.2]])
+        observed[:, :3] = [[1.0, 0.5, 0.8], [0.5, 0.5, 0.0], [0.1, 0.1, -1.0]]
+        work[3:6] = observed
+        batch._inverse(*work[3:6], *work[6:9], work[9], work[10])
+        np.testing.assert_allclose(work[6:9], np.stack(inverse_ez(*observed)), rtol=1e-10)
+    
+    def test_float32_run(self):
+        """Test the float32 pipeline and the reuse of its buffers"""
+        batch = CompactBatch(20000)
+        params, estimates, errors = batch.run(20000, 4000, PARAMETER_RANGES, np.random.default_rng(1))
+        
+        self.assertEqual(errors.dtype, np.float32)
+        self.assertTrue(np.shares_memory(errors, batch.errors))
+        self.assertTrue(np.all((estimates[0] >= 0.1) & (estimates[0] <= 5.0)))
+        np.testing.assert_allclose(errors[:3], params - estimates)
+        self.assertLess(np.max(np.abs(np.mean(errors[:3], axis=1))), 0.01)
+        
+        with self.assertRaises(ValueError):
+            batch.run(20001, 40, PARAMETER_RANGES, np.random.default_rng(1))
+    
+    def test_precision_comparison(self):
+        """Test that float32 recovery of the same data sets stays far below the Monte Carlo error"""
+        for N in [10, 4000]:
+            difference, standard_error = compare_precision(50000, N, PARAMETER_RANGES, seed=0, chunk_size=20000)
+            self.assertTrue(np.all(difference > 0))
+            self.assertTrue(np.all(difference < 0.01 * standard_error))
+    
+    def test_compact_simulation(self):
+        """Test run_simulation in compact mode against the float64 chunked engine"""
+        kwargs = dict(iterations=40000, N_values=[40, 4000], seed=3, chunk_size=7000)
+        with contextlib.redirect_stdout(io.StringIO()):
+            compact = run_simulation(compact=True, **kwargs)
+            reference = run_simulation(workers=1, **kwargs)
+            parallel = run_simulation(compact=True, workers=2, **kwargs)
+        
+        # Parallel compact rows stay float32 in shared memory
+        for N in [40, 4000]:
+            self.assertEqual(parallel[N]['v_true'].dtype, np.float32)
+            np.testing.assert_array_equal(parallel[N]['biases'], compact[N]['biases'])
+        
+        for N in [40, 4000]:
+            self.assertEqual(compact[N]['v_true'].dtype, np.float32)
+            self.assertEqual(compact[N]['biases'].shape, (40000, 3))
+            for key in ['avg_bias_v', 'avg_bias_alpha', 'avg_bias_tau', 'avg_squared_error']:
+                se = reference[N]['se' + key[3:]]
+                self.assertLess(abs(compact[N][key] - reference[N][key]), 5 * np.sqrt(2) * se)
+
+if __name__ == '__main__':
+    unittest.main()
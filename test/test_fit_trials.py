@@ -0,0 +1,105 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+import csv
+import tempfile
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from src.simulate_and_recover import inverse_ez
+from src.trial_simulation import simulate_trials
+from src.fit_trials import fit_trials_csv, save_fits
+
+class TestFitTrials(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'trials.csv')
+        
+        correct, rt = simulate_trials([1.0, 1.5, 0.8], [1.0, 1.2, 1.5], [0.3, 0.2, 0.25], 400, rng=0)
+        self.trials = {('s1', 'easy'): (correct[0], rt[0]), ('s1', 'hard'): (correct[1], rt[1]),
+                       ('s2', 'easy'): (correct[2], rt[2])}
+        
+        # Interleave the groups so every chunk holds several of them
+        with open(self.path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['subject', 'condition', 'correct', 'rt'])
+            for j in range(400):
+                for (subject, condition), (group_correct, group_rt) in self.trials.items():
+                    writer.writerow([subject, condition, 'true' if group_correct[j] else 'false', f"{group_rt[j]:.6f}"])
+            writer.writerow(['s2', 'easy', '1', ''])
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_per_group_statistics(self):
+        """Test that streamed per-group statistics match direct computation"""
+        fits = fit_trials_csv(self.path, chunk_rows=97)
+        
+        self.assertEqual(fits['groups'], list(self.trials))
+        for i, (correct, rt) in enumerate(self.trials.values()):
+            rt = np.round(rt, 6)
+            self.assertEqual(fits['n'][i], 400)
+            self.assertAlmostEqual(fits['R_obs'][i], np.mean(correct))
+            self.assertAlmostEqual(fits['M_obs'][i], np.mean(rt[correct]))
+            self.assertAlmostEqual(fits['V_obs'][i], np.var(rt[correct], ddof=1))
+        
+        expected = inverse_ez(fits['R_obs'], fits['M_obs'], fits['V_obs'])
+        np.testing.assert_allclose(fits['v'], expected[0])
+        np.testing.assert_allclose(fits['tau'], expected[2])
+        
+        # The chunk size does not change the result
+        single = fit_trials_csv(self.path, chunk_rows=100000)
+        np.testing.assert_allclose(single['V_obs'], fits['V_obs'])
+    
+    def test_grouping_and_output(self):
+        """Test grouping by a subset of columns, writing fits and missing columns"""
+        fits = fit_trials_csv(self.path, group_columns=('subject',))
+        self.assertEqual(fits['groups'], [('s1',), ('s2',)])
+        self.assertEqual(fits['n'][0], 800)
+        
+        output = os.path.join(self.tmp.name, 'fits.csv')
+        save_fits(fits, output)
+        with open(output) as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ['subject', 'n', 'R_obs', 'M_obs', 'V_obs', 'v', 'alpha', 'tau'])
+        self.assertEqual(rows[2][:2], ['s2', '400'])
+        
+        with self.assertRaises(ValueError):
+            fit_trials_csv(self.path, group_columns=('participant',))
+    
+    def test_numeric_flags_and_missing_tokens(self):
+        """Test numeric correct flags and NA-style missing RTs"""
+        path = os.path.join(self.tmp.name, 'numeric.csv')
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['subject', 'condition', 'correct', 'rt'])
+            writer.writerows([['s1', 'a', '1.0', '0.5'], ['s1', 'a', ' True ', '0.7'], ['s1', 'a', '0.0', '0.9'],
+                              ['s1', 'a', 'no', '0.4'], ['s1', 'a', '1.0', 'NA'], ['s1', 'a', '1', 'nan'],
+                              ['s1', 'a', '2', '0.6']])
+        
+        fits = fit_trials_csv(path)
+        self.assertEqual(fits['n'][0], 5)
+        self.assertAlmostEqual(fits['R_obs'][0], 3 / 5)
+        self.assertAlmostEqual(fits['M_obs'][0], 0.6)
+    
+    def test_blank_and_short_rows(self):
+        """Test that blank lines are skipped and short rows are reported by line"""
+        path = os.path.join(self.tmp.name, 'blank.csv')
+        with open(path, 'w') as f:
+            f.write("subject,condition,correct,rt\ns1,a,1,0.7\n\ns1,a,1,0.5\n\n")
+        
+        fits = fit_trials_csv(path)
+        self.assertEqual(fits['n'][0], 2)
+        self.assertAlmostEqual(fits['M_obs'][0], 0.6)
+        
+        with open(path, 'w') as f:
+            f.write("subject,condition,correct,rt\ns1,a,1,0.7\ns1,a,1\n")
+        with self.assertRaisesRegex(ValueError, 'Line 3'):
+            fit_trials_csv(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import json
+import tempfile
+import unittest
+import contextlib
+import numpy as np
+from src.instrumentation import instrumentation, instrumented
+from src.simulate_and_recover import inverse_ez, simulate_and_recover_batch
+from src.simulation_main import run_simulation, save_results
+
+class TestInstrumentation(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        """Test that nothing is recorded while instrumentation is disabled"""
+        instrumentation.reset()
+        simulate_and_recover_batch(np.ones(10), np.ones(10), np.full(10, 0.3), 10, rng=0)
+        inverse_ez(1.0, 0.5, -1.0)
+        
+        report = instrumentation.report()
+        self.assertEqual(report['stages'], {})
+        self.assertEqual(report['counters'], {})
+    
+    def test_stages_and_guard_counts(self):
+        """Test per-stage timings and guard-activation counters"""
+        with instrumented() as session:
+            simulate_and_recover_batch(np.ones(10), np.ones(10), np.full(10, 0.3), 10, rng=0)
+        
+        report = session.report()
+        for name in ('forward', 'sampling', 'inverse', 'clipping'):
+            self.assertEqual(report['stages'][name]['calls'], 1)
+            self.assertGreaterEqual(report['stages'][name]['seconds'], 0.0)
+        
+        with instrumented() as session:
+            inverse_ez(np.array([0.0, 0.5, 1.0]), 0.5, np.array([-1.0, 0.1, 0.1]))
+        
+        report = session.report()
+        self.assertEqual(report['counters']['inverse_R_clipped'], 2)
+        self.assertEqual(report['counters']['inverse_V_floored'], 1)
+        self.assertGreaterEqual(report['counters']['fourth_root_clamped'], 1)
+        self.assertFalse(instrumentation.enabled)
+    
+    def test_throughput_io_and_profile(self):
+        """Test iteration throughput, save_results I/O timing and the cProfile hook"""
+        with tempfile.TemporaryDirectory() as output_dir, contextlib.redirect_stdout(io.StringIO()):
+            with instrumented(profile=True) as session:
+                results = run_simulation(iterations=20, N_values=[10, 40], seed=1)
+                save_results(results, output_dir)
+            
+            report_file = os.path.join(output_dir, 'report.json')
+            session.save_report(report_file)
+            with open(report_file) as f:
+                report = json.load(f)
+        
+        self.assertEqual(report['stages']['run_simulation']['items'], 40)
+        self.assertGreater(report['stages']['run_simulation']['items_per_second'], 0)
+        self.assertEqual(report['stages']['forward']['calls'], 40)
+        self.assertEqual(report['stages']['io']['calls'], 3)
+        self.assertIn('simulate_and_recover', report['profile'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+import tempfile
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from src.simulate_and_recover import forward_ez, inverse_ez, simulate_observed_stats_batch, simulate_and_recover_batch
+from src.bootstrap import bootstrap_ez
+from src.lookup_table import InverseLookupTable, cached_table
+
+class TestLookupTable(unittest.TestCase):
+    def test_error_bound(self):
+        """Test that a table built to a tolerance stays within it against inverse_ez"""
+        table = InverseLookupTable.build_to_tolerance(1e-4)
+        self.assertLessEqual(max(table.max_error.values()), 1e-4)
+        
+        # Simulated observations (more than one block), including the guarded
+        # R = 0.5, R = 1 and V = 0 cases and non-finite inputs
+        rng = np.random.default_rng(0)
+        n = 40000
+        v, alpha, tau = rng.uniform(0.5, 2.0, n), rng.uniform(0.5, 2.0, n), rng.uniform(0.1, 0.5, n)
+        R_obs, M_obs, V_obs = simulate_observed_stats_batch(*forward_ez(v, alpha, tau), 40, rng)
+        R_obs[:5] = [0.5, 1.0, 0.0, np.nan, np.inf]
+        M_obs[5], V_obs[6], V_obs[7] = np.nan, 0.0, np.nan
+        
+        approximate = table(R_obs, M_obs, V_obs)
+        exact = inverse_ez(R_obs, M_obs, V_obs)
+        for x, y in zip(approximate, exact):
+            # The bound is validated for V >= 1e-4; the floored V = 0 is only relatively close
+            np.testing.assert_allclose(x, y, rtol=1e-5, atol=1e-4)
+        
+        # Scalars and shapes behave like inverse_ez
+        self.assertEqual(table(0.5, 0.5, 0.1), inverse_ez(0.5, 0.5, 0.1))
+        self.assertEqual(table(np.full((2, 3), 0.7), 0.5, 0.1)[1].shape, (2, 3))
+    
+    def test_drop_in_inverse(self):
+        """Test the table as the inverse of simulate_and_recover_batch and bootstrap_ez"""
+        table = InverseLookupTable.build_to_tolerance(1e-5)
+        rng = np.random.default_rng(1)
+        v, alpha, tau = rng.uniform(0.5, 2.0, 5000), rng.uniform(0.5, 2.0, 5000), rng.uniform(0.1, 0.5, 5000)
+        
+        exact = simulate_and_recover_batch(v, alpha, tau, 40, rng=2)
+        approximate = simulate_and_recover_batch(v, alpha, tau, 40, rng=2, inverse=table)
+        np.testing.assert_allclose(approximate[3], exact[3], rtol=1e-4, atol=1e-4)
+        
+        exact = bootstrap_ez([0.8, 0.7], [0.5, 0.6], [0.05, 0.08], 100, n_boot=500, rng=3)
+        approximate = bootstrap_ez([0.8, 0.7], [0.5, 0.6], [0.05, 0.08], 100, n_boot=500, rng=3, inverse=table)
+        np.testing.assert_array_equal(approximate['v'], exact['v'])
+        np.testing.assert_allclose(approximate['alpha_ci'], exact['alpha_ci'], atol=1e-4)
+    
+    def test_disk_cache(self):
+        """Test that cached tables are built once and reloaded with their error report"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            built = cached_table(1e-3, cache_dir=cache_dir)
+            self.assertEqual(os.listdir(cache_dir), ['inverse_ez_logit_table_0.001.npz'])
+            
+            loaded = cached_table(1e-3, cache_dir=cache_dir)
+            np.testing.assert_array_equal(loaded.values, built.values)
+            self.assertEqual(loaded.max_error, built.max_error)
+            self.assertEqual(loaded(0.8, 0.6, 0.05), built(0.8, 0.6, 0.05))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import tempfile
+import unittest
+import contextlib
+import numpy as np
+from src.results_store import ResultsStore
+from src.simulation_main import run_simulation
+
+class TestResultsStore(unittest.TestCase):
+    def setUp(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.first = run_simulation(iterations=500, N_values=[10, 40], seed=1, workers=1)
+            self.second = run_simulation(iterations=300, N_values=[40], seed=2, workers=1)
+    
+    def test_append_and_query(self):
+        """Test incremental appends and range queries against direct masks"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'results.db')
+            with ResultsStore(path) as store:
+                first_id = store.append(self.first, description='first')
+            
+            # Reopen and append a second sweep
+            with ResultsStore(path) as store:
+                second_id = store.append(self.second)
+                self.assertEqual([(run[0], run[2], run[3]) for run in store.runs()],
+                                 [(first_id, 'first', 1000), (second_id, None, 300)])
+                
+                rows = store.query(columns=('v_true', 'bias_alpha'), N=40, v_true=(None, 0.7), run_id=first_id)
+                mask = self.first[40]['v_true'] < 0.7
+                np.testing.assert_array_equal(rows['v_true'], self.first[40]['v_true'][mask])
+                np.testing.assert_array_equal(rows['bias_alpha'], self.first[40]['biases'][mask, 1])
+                
+                self.assertEqual(len(store.query(N=40)['N']), 800)
+                self.assertEqual(len(store.query(N=[10, 40], tau_true=(0.2, 0.3))['N']),
+                                 sum(np.sum((data[N]['tau_true'] >= 0.2) & (data[N]['tau_true'] < 0.3))
+                                     for data in (self.first, self.second) for N in data))
+                
+                # Range queries use the (N, parameter) indexes
+                plan = store.connection.execute("EXPLAIN QUERY PLAN SELECT bias_alpha FROM results "
+                                                "WHERE N = 40 AND v_true < 0.7").fetchall()
+                self.assertIn('results_v', str(plan))
+                
+                with self.assertRaises(ValueError):
+                    store.query(columns=('v_true; DROP TABLE results',))
+    
+    def test_binned_aggregates(self):
+        """Test per-bin counts, mean biases and MSE against NumPy"""
+        with tempfile.TemporaryDirectory() as tmp, ResultsStore(os.path.join(tmp, 'results.db')) as store:
+            store.append(self.first)
+            edges = np.array([0.5, 1.0, 1.5, 2.0])
+            summary = store.aggregate('alpha_true', edges, N=40)
+            
+            data = self.first[40]
+            bins = np.digitize(data['alpha_true'], edges) - 1
+            np.testing.assert_array_equal(summary['N'], [40, 40, 40])
+            np.testing.assert_array_equal(summary['bin'], [0, 1, 2])
+            for i in range(3):
+                self.assertEqual(summary['count'][i], np.sum(bins == i))
+                self.assertAlmostEqual(summary['mean_bias_alpha'][i], np.mean(data['biases'][bins == i, 1]))
+                self.assertAlmostEqual(summary['mse'][i], np.mean(data['squared_errors'][bins == i]))
+            
+            overall = store.aggregate()
+            np.testing.assert_array_equal(overall['N'], [10, 40])
+            self.assertAlmostEqual(overall['mean_bias_v'][0], self.first[10]['avg_bias_v'])
+            
+            # Without an N filter every bin is still searched through the index, one N at a time
+            statements = []
+            store.connection.set_trace_callback(statements.append)
+            unfiltered = store.aggregate('v_true', edges)
+            store.connection.set_trace_callback(None)
+            plan = str(store.connection.execute("EXPLAIN QUERY PLAN " + statements[-1]).fetchall())
+            self.assertIn('SEARCH results USING INDEX results_v', plan)
+            self.assertNotIn('SCAN results', plan)
+            np.testing.assert_array_equal(unfiltered['N'], [10] * 3 + [40] * 3)
+            self.assertEqual(store.N_values(), [10, 40])
+
+if __name__ == '__main__':
+    unittest.main()
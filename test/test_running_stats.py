@@ -0,0 +1,53 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from src.running_stats import RunningStats, merge_moments
+
+class TestRunningStats(unittest.TestCase):
+    def test_batches_match_direct_moments(self):
+        """Test that streaming updates reproduce the mean and variance of all data"""
+        rng = np.random.default_rng(0)
+        data = rng.normal(loc=[1.0, -2.0], scale=[0.5, 3.0], size=(1000, 2))
+        
+        stats = RunningStats(2)
+        for start in range(0, 1000, 37):
+            stats.update(data[start:start + 37])
+        
+        self.assertEqual(stats.count, 1000)
+        np.testing.assert_allclose(stats.mean, np.mean(data, axis=0))
+        np.testing.assert_allclose(stats.variance, np.var(data, axis=0, ddof=1))
+        np.testing.assert_allclose(stats.standard_error, np.std(data, axis=0, ddof=1) / np.sqrt(1000))
+    
+    def test_merge(self):
+        """Test merging accumulators, including empty ones"""
+        rng = np.random.default_rng(1)
+        first, second = rng.normal(size=(10, 3)), rng.normal(size=(25, 3))
+        
+        a, b = RunningStats(3), RunningStats(3)
+        a.update(first)
+        b.update(second)
+        a.merge(b)
+        a.merge(RunningStats(3))
+        
+        combined = np.vstack([first, second])
+        np.testing.assert_allclose(a.mean, np.mean(combined, axis=0))
+        np.testing.assert_allclose(a.variance, np.var(combined, axis=0, ddof=1))
+        self.assertTrue(np.all(np.isnan(RunningStats(3).variance)))
+    
+    def test_merge_moments_elementwise(self):
+        """Test merge_moments on arrays of independent accumulators"""
+        n, mean, m2 = merge_moments(np.array([0, 2]), np.array([0.0, 1.0]), np.array([0.0, 2.0]),
+                                    np.array([0, 2]), np.array([0.0, 3.0]), np.array([0.0, 2.0]))
+        np.testing.assert_array_equal(n, [0, 4])
+        np.testing.assert_allclose(mean, [0.0, 2.0])
+        np.testing.assert_allclose(m2, [0.0, 8.0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import errno
+import socket
+import asyncio
+import tempfile
+import unittest
+import contextlib
+from src.service import SimulationService, normalize_spec, stream_request
+from src.simulation_main import run_simulation
+
+async def _collect(spec, socket_path, request_id):
+    return [event async for event in stream_request(spec, socket_path, request_id)]
+
+class TestSimulationService(unittest.TestCase):
+    def test_normalize_spec(self):
+        """Test that equivalent requests normalize to the same spec and bad ones are rejected"""
+        self.assertEqual(normalize_spec({'seed': 1, 'N_values': [10.0]}),
+                         normalize_spec({'N_values': [10], 'seed': 1, 'ranges': {'v': [0.5, 2.0]}}))
+        with self.assertRaises(ValueError):
+            normalize_spec({'iteration': 10})
+        with self.assertRaises(ValueError):
+            normalize_spec({'ranges': {'z': [0, 1]}})
+        for spec in ({'ranges': {'v': [1.0]}}, {'ranges': {'v': [2.0, 1.0]}}, {'ranges': {'tau': [0.1, 0.5, 1.0]}},
+                     {'ranges': {'alpha': [float('nan'), 1.0]}}, {'ranges': {'v': [0.5, float('inf')]}},
+                     {'N_values': [0]}, {'iterations': 10**9, 'chunk_size': 1},
+                     {'iterations': 10**9, 'chunk_size': 10**9}):
+            with self.assertRaises(ValueError):
+                normalize_spec(spec)
+        
+        # A large chunk_size is fine when the chunks themselves stay small
+        self.assertEqual(normalize_spec({'iterations': 100, 'chunk_size': 10**9})['chunk_size'], 10**9)
+    
+    def test_concurrent_requests(self):
+        """Test streamed results, deduplication of identical requests and error reporting"""
+        spec = {'iterations': 300, 'N_values': [10, 40], 'seed': 4, 'chunk_size': 100}
+        
+        async def scenario(socket_path):
+            service = SimulationService(socket_path, workers=2)
+            await service.start()
+            try:
+                first, second, bad = await asyncio.gather(
+                    _collect(spec, socket_path, 'a'), _collect(spec, socket_path, 'b'),
+                    _collect({'iterations': 0}, socket_path, 'c'))
+            finally:
+                await service.close()
+            return service, first, second, bad
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            service, first, second, bad = asyncio.run(scenario(os.path.join(tmp, 'ez.sock')))
+        
+        self.assertEqual((service.requests, service.jobs_started), (3, 1))
+        self.assertEqual([event['event'] for event in bad], ['error'])
+        self.assertEqual(bad[0]['id'], 'c')
+        
+        for events, request_id in [(first, 'a'), (second, 'b')]:
+            self.assertTrue(all(event['id'] == request_id for event in events))
+            self.assertEqual([event['completed'] for event in events if event['event'] == 'progress'],
+                             list(range(1, 7)))
+            self.assertEqual(sorted(event['N'] for event in events if event['event'] == 'result'), [10, 40])
+            self.assertEqual(events[-1]['event'], 'done')
+        
+        # Same summaries as the chunked engine in streaming mode
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = run_simulation(keep_rows=False, **spec)
+        for N in [10, 40]:
+            summary = first[-1]['results'][str(N)]
+            self.assertEqual(summary['iterations'], 300)
+            for key in ['avg_bias_v', 'avg_bias_alpha', 'avg_bias_tau', 'avg_squared_error', 'se_squared_error']:
+                self.assertEqual(summary[key], expected[N][key])
+
+    def test_socket_ownership(self):
+        """Test that a live socket is not taken over and only the owner removes its socket"""
+        async def scenario(socket_path):
+            first = SimulationService(socket_path, workers=1)
+            await first.start()
+            try:
+                # A second instance refuses to start and leaves the running one alone
+                second = SimulationService(socket_path, workers=1)
+                with self.assertRaises(OSError) as raised:
+                    await second.start()
+                self.assertEqual(raised.exception.errno, errno.EADDRINUSE)
+                await second.close()
+                self.assertTrue(os.path.exists(socket_path))
+                
+                # Once the path belongs to another service, closing does not remove it
+                os.unlink(socket_path)
+                third = SimulationService(socket_path, workers=1)
+                await third.start()
+            finally:
+                await first.close()
+            self.assertTrue(os.path.exists(socket_path))
+            await third.close()
+            self.assertFalse(os.path.exists(socket_path))
+            
+            # A stale socket file from a service that is gone is replaced
+            stale = socket.socket(socket.AF_UNIX)
+            stale.bind(socket_path)
+            stale.close()
+            fourth = SimulationService(socket_path, workers=1)
+            await fourth.start()
+            await fourth.close()
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            asyncio.run(scenario(os.path.join(tmp, 'ez.sock')))
+
+if __name__ == '__main__':
+    unittest.main()
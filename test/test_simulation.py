@@ -8,7 +8,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../s
 
 import unittest
 import numpy as np
-from simulate_and_recover import forward_ez, inverse_ez, simulate_observed_stats, simulate_and_recover
+from simulate_and_recover import (forward_ez, inverse_ez, simulate_observed_stats, simulate_and_recover,
+                                  simulate_observed_stats_batch, simulate_and_recover_batch,
+                                  forward_ez_jacobian, inverse_ez_jacobian, ForwardCache)
 
 class TestEZDiffusion(unittest.TestCase):
     def test_forward_ez(self):
@@ -220,5 +222,162 @@ class TestEZDiffusion(unittest.TestCase):
                 self.assertLess(abs(np.var(M_samples) - expected_var_M) / expected_var_M, 0.5, 
                             msg=f"M variance for N={N} is too far from expected")
 
+    def test_vectorized_forward_inverse(self):
+        """Test that array inputs match element-wise scalar calls and keep their shape"""
+        rng = np.random.default_rng(0)
+        v = rng.uniform(0.5, 2.0, size=(4, 5))
+        alpha = rng.uniform(0.5, 2.0, size=(4, 5))
+        tau = rng.uniform(0.1, 0.5, size=(4, 5))
+        
+        R_pred, M_pred, V_pred = forward_ez(v, alpha, tau)
+        self.assertEqual(R_pred.shape, (4, 5))
+        
+        v_est, alpha_est, tau_est = inverse_ez(R_pred, M_pred, V_pred)
+        np.testing.assert_allclose(v_est, v, rtol=1e-8)
+        np.testing.assert_allclose(alpha_est, alpha, rtol=1e-8)
+        np.testing.assert_allclose(tau_est, tau, rtol=1e-8)
+        
+        for idx in np.ndindex(v.shape):
+            scalar = forward_ez(v[idx], alpha[idx], tau[idx])
+            self.assertAlmostEqual(R_pred[idx], scalar[0], places=12)
+            self.assertAlmostEqual(M_pred[idx], scalar[1], places=12)
+            self.assertAlmostEqual(V_pred[idx], scalar[2], places=12)
+    
+    def test_vectorized_guards(self):
+        """Test that the inverse guards are applied element-wise"""
+        R_obs = np.array([0.5, 1.0, 0.8, 0.8])
+        M_obs = np.array([0.5, 0.5, 0.5, 0.0])
+        V_obs = np.array([0.1, 0.1, -1.0, 0.1])
+        
+        v_est, alpha_est, tau_est = inverse_ez(R_obs, M_obs, V_obs)
+        for i in range(len(R_obs)):
+            expected = inverse_ez(float(R_obs[i]), float(M_obs[i]), float(V_obs[i]))
+            self.assertAlmostEqual(v_est[i], expected[0], places=10)
+            self.assertAlmostEqual(alpha_est[i], expected[1], places=10)
+            self.assertAlmostEqual(tau_est[i], expected[2], places=10)
+        
+        # Accuracy of exactly 0.5 gives a tiny positive drift, and tau is never negative
+        self.assertGreater(v_est[0], 0)
+        self.assertEqual(tau_est[3], 0.0)
+
+    def test_scalar_fast_path(self):
+        """Test that the scalar fast paths agree with the array path, guards included"""
+        params = np.array([[1.0, 1.2, 0.3], [0.0, 1.0, 0.3], [-0.7, 2.0, 0.2], [3.0, 0.5, 0.1]])
+        forward = forward_ez(*params.T)
+        for i, (v, alpha, tau) in enumerate(params.tolist()):
+            scalar = forward_ez(v, alpha, tau)
+            self.assertNotIsInstance(scalar[0], np.ndarray)
+            np.testing.assert_allclose(scalar, [column[i] for column in forward], rtol=1e-12)
+
+        stats = np.array([[0.8, 0.5, 0.05], [0.5, 0.5, 0.1], [1.0, 0.5, 0.1], [0.0, 0.4, 0.1],
+                          [0.8, 0.5, -1.0], [0.8, 0.0, 0.1], [0.3, 0.6, 0.2], [np.nan, 0.5, 0.1]])
+        inverse = inverse_ez(*stats.T)
+        for i, (R, M, V) in enumerate(stats.tolist()):
+            scalar = inverse_ez(R, M, V)
+            np.testing.assert_allclose(scalar, [column[i] for column in inverse], rtol=1e-12)
+
+    def test_simulate_observed_stats_batch(self):
+        """Test the batched sampler against the moments of Eqs. 7-9"""
+        R_pred, M_pred, V_pred = 0.75, 0.7, 0.05
+        size = 200000
+        
+        for N in [10, 100]:
+            R_obs, M_obs, V_obs = simulate_observed_stats_batch(
+                np.full(size, R_pred), np.full(size, M_pred), np.full(size, V_pred), N,
+                rng=np.random.default_rng(42))
+            
+            self.assertEqual(R_obs.shape, (size,))
+            self.assertAlmostEqual(np.mean(R_obs), R_pred, places=2)
+            self.assertAlmostEqual(np.mean(M_obs), M_pred, places=2)
+            self.assertAlmostEqual(np.mean(V_obs), V_pred, places=3)
+            self.assertLess(abs(np.var(R_obs) / (R_pred * (1 - R_pred) / N) - 1), 0.05)
+            self.assertLess(abs(np.var(M_obs) / (V_pred / N) - 1), 0.05)
+            self.assertLess(abs(np.var(V_obs) / (2 * V_pred**2 / (N - 1)) - 1), 0.05)
+        
+        # The same seed reproduces the same draws
+        first = simulate_observed_stats_batch(R_pred, M_pred, V_pred, 40, rng=7)
+        second = simulate_observed_stats_batch(R_pred, M_pred, V_pred, 40, rng=7)
+        self.assertEqual(first, second)
+    
+    def test_batch_sampler_sample_sizes(self):
+        """Test that whole float sample sizes are accepted and fractional ones rejected"""
+        as_float = simulate_observed_stats_batch(0.8, 0.5, 0.1, 40.0, rng=1)
+        as_int = simulate_observed_stats_batch(0.8, 0.5, 0.1, 40, rng=1)
+        self.assertEqual(as_float, as_int)
+        
+        R_obs, _, _ = simulate_observed_stats_batch(np.full(3, 0.8), 0.5, 0.1, np.array([10.0, 40.0, 4000.0]), rng=1)
+        self.assertEqual(R_obs.shape, (3,))
+        
+        for N in [40.5, np.nan, np.array([10.0, 12.5])]:
+            with self.assertRaises(ValueError):
+                simulate_observed_stats_batch(0.8, 0.5, 0.1, N, rng=1)
+    
+    def test_simulate_and_recover_batch(self):
+        """Test the batched simulate-and-recover engine"""
+        rng = np.random.default_rng(0)
+        v = rng.uniform(0.5, 2.0, 1000)
+        alpha = rng.uniform(0.5, 2.0, 1000)
+        tau = rng.uniform(0.1, 0.5, 1000)
+        
+        v_est, alpha_est, tau_est, bias, squared_error = simulate_and_recover_batch(v, alpha, tau, 4000, rng)
+        
+        self.assertEqual(bias.shape, (1000, 3))
+        np.testing.assert_allclose(bias, np.stack([v - v_est, alpha - alpha_est, tau - tau_est], axis=-1))
+        np.testing.assert_allclose(squared_error, np.sum(bias**2, axis=1))
+        self.assertTrue(np.all((v_est >= 0.1) & (v_est <= 5.0)))
+        self.assertTrue(np.all((tau_est >= 0.01) & (tau_est <= 1.0)))
+        
+        # With N = 4000 the average bias should be close to zero
+        self.assertLess(np.max(np.abs(np.mean(bias, axis=0))), 0.02)
+        self.assertLess(np.mean(squared_error), 0.01)
+
+    def test_jacobians(self):
+        """Test the analytic Jacobians against central finite differences"""
+        rng = np.random.default_rng(0)
+        params = np.stack([rng.uniform(0.5, 2.0, 50), rng.uniform(0.5, 2.0, 50), rng.uniform(0.1, 0.5, 50)])
+        observed = np.stack(forward_ez(*params)) * np.array([1.0, 1.0, 1.1])[:, None]
+        
+        for function, jacobian_function, point in [(forward_ez, forward_ez_jacobian, params),
+                                                   (inverse_ez, inverse_ez_jacobian, observed)]:
+            *values, jacobian = jacobian_function(*point)
+            np.testing.assert_array_equal(np.stack(values), np.stack(function(*point)))
+            self.assertEqual(jacobian.shape, (50, 3, 3))
+            
+            for j in range(3):
+                step = np.zeros((3, 1))
+                step[j] = 1e-6 * np.mean(point[j])
+                numeric = (np.stack(function(*(point + step))) - np.stack(function(*(point - step)))) / (2 * step[j])
+                np.testing.assert_allclose(jacobian[:, :, j], numeric.T, rtol=1e-5, atol=1e-8)
+        
+        # The inverse Jacobian at the predictions undoes the forward Jacobian
+        *_, forward_jacobian = forward_ez_jacobian(*params)
+        *_, inverse_jacobian = inverse_ez_jacobian(*forward_ez(*params))
+        np.testing.assert_allclose(inverse_jacobian @ forward_jacobian, np.broadcast_to(np.eye(3), (50, 3, 3)),
+                                   atol=1e-10)
+
+    def test_forward_cache(self):
+        """Test the LRU forward cache"""
+        cache = ForwardCache(maxsize=2)
+        self.assertEqual(cache(1.0, 1.0, 0.3), forward_ez(1.0, 1.0, 0.3))
+        cache(1.0, 1.0, 0.3)
+        cache(1.5, 1.0, 0.3)
+        cache(2.0, 1.0, 0.3)  # Evicts the least recently used (1.0, 1.0, 0.3)
+        cache(1.0, 1.0, 0.3)
+        self.assertEqual(cache.cache_info(), {'hits': 1, 'misses': 4, 'size': 2, 'maxsize': 2})
+        
+        cache = ForwardCache(jacobian=True)
+        np.testing.assert_array_equal(cache(0.7, 1.2, 0.3)[3], forward_ez_jacobian(0.7, 1.2, 0.3)[3])
+        
+        # The shared Jacobian cannot be modified through a hit
+        with self.assertRaises(ValueError):
+            cache(0.7, 1.2, 0.3)[3][0, 0] = 0.0
+        
+        # Cached predictions leave simulate_and_recover unchanged
+        np.random.seed(5)
+        expected = simulate_and_recover(1.0, 1.0, 0.3, 40)
+        np.random.seed(5)
+        cached = simulate_and_recover(1.0, 1.0, 0.3, 40, cache=ForwardCache())
+        np.testing.assert_array_equal(cached[3], expected[3])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
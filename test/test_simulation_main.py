@@ -0,0 +1,277 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+import gc
+import tempfile
+from unittest import mock
+from multiprocessing import shared_memory
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+import src.simulation_main as simulation_main
+from src.simulation_main import run_simulation, save_results, load_results, export_text, RESULT_COLUMNS
+
+class TestRunSimulation(unittest.TestCase):
+    def test_chunked_engine_is_independent_of_worker_count(self):
+        """Test that the chunked engine gives bit-identical results for any worker count"""
+        serial = run_simulation(iterations=250, N_values=[10, 40], seed=3, workers=1, chunk_size=60)
+        parallel = run_simulation(iterations=250, N_values=[10, 40], seed=3, workers=2, chunk_size=60)
+        
+        for N in [10, 40]:
+            for key in ['v_true', 'alpha_true', 'tau_true', 'v_est', 'alpha_est', 'tau_est',
+                        'biases', 'squared_errors']:
+                np.testing.assert_array_equal(serial[N][key], parallel[N][key])
+            self.assertEqual(serial[N]['avg_squared_error'], parallel[N]['avg_squared_error'])
+            self.assertEqual(len(serial[N]['v_true']), 250)
+    
+    def test_parallel_rows_use_shared_memory(self):
+        """Test that parallel rows are views of one shared table that outlive the run"""
+        results = run_simulation(iterations=250, N_values=[10, 40], seed=3, workers=2, chunk_size=60)
+        gc.collect()
+        
+        table = results[10]['v_true'].base
+        self.assertIsInstance(table.base, simulation_main._SharedRows)
+        for N in [10, 40]:
+            for key in ['v_true', 'tau_est', 'biases', 'squared_errors']:
+                self.assertTrue(np.shares_memory(results[N][key], table))
+        
+        # The segment's name is already removed
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=table.base.segment.name)
+        
+        # The rows stay readable after the run, and save without stacking copies
+        with tempfile.TemporaryDirectory() as output_dir:
+            save_results(results, output_dir, format='npy')
+            loaded = load_results(output_dir, mmap=False)
+        np.testing.assert_array_equal(loaded[40]['bias_alpha'], results[40]['biases'][:, 1])
+        np.testing.assert_array_equal(loaded[40]['squared_error'], results[40]['squared_errors'])
+        
+        # A resumed parallel run fills the shared table from the checkpoint rows
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = os.path.join(tmp, 'sweep.ckpt')
+            kwargs = dict(iterations=250, N_values=[10, 40], seed=3, chunk_size=60, checkpoint=checkpoint)
+            run_simulation(workers=1, **kwargs)
+            resumed = run_simulation(workers=2, resume=True, **kwargs)
+        for N in [10, 40]:
+            np.testing.assert_array_equal(resumed[N]['biases'], results[N]['biases'])
+        
+        # The segment is removed even if the pool cannot be started
+        created = []
+        original = simulation_main._SharedRows
+        
+        def recording(*args):
+            created.append(original(*args))
+            return created[-1]
+        
+        with mock.patch.object(simulation_main, '_SharedRows', recording), \
+                mock.patch.object(simulation_main, 'ProcessPoolExecutor', side_effect=OSError):
+            with self.assertRaises(OSError):
+                run_simulation(iterations=50, N_values=[10], seed=3, workers=2)
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=created[0].segment.name)
+    
+    def test_chunked_engine_results(self):
+        """Test that the chunked engine recovers parameters and respects the ranges"""
+        results = run_simulation(iterations=2000, N_values=[4000], seed=1, workers=1,
+                                 ranges={'v': (1.0, 1.5)})
+        data = results[4000]
+        
+        self.assertTrue(np.all((data['v_true'] >= 1.0) & (data['v_true'] < 1.5)))
+        self.assertTrue(np.all((data['tau_true'] >= 0.1) & (data['tau_true'] < 0.5)))
+        self.assertLess(abs(data['avg_bias_v']), 0.02)
+        self.assertLess(data['avg_squared_error'], 0.01)
+        
+        # A different seed gives different draws
+        other = run_simulation(iterations=2000, N_values=[4000], seed=2, workers=1)
+        self.assertFalse(np.array_equal(data['v_true'], other[4000]['v_true']))
+    
+    def test_chunked_results_can_be_saved(self):
+        """Test that save_results accepts the chunked engine's output"""
+        results = run_simulation(iterations=20, N_values=[10], seed=0, workers=1, chunk_size=7)
+        
+        with tempfile.TemporaryDirectory() as output_dir:
+            save_results(results, output_dir)
+            with open(os.path.join(output_dir, 'results_N10.txt')) as f:
+                lines = f.read().splitlines()
+        
+        self.assertEqual(len(lines), 22)
+        self.assertTrue(lines[2].startswith(f"1,{results[10]['v_true'][0]:.6f},"))
+        
+        # No iterations give undefined averages rather than perfect recovery
+        empty = run_simulation(iterations=0, N_values=[10], seed=0, keep_rows=False)
+        self.assertEqual(empty[10]['iterations'], 0)
+        for key in ['avg_bias_v', 'avg_bias_alpha', 'avg_bias_tau', 'avg_squared_error']:
+            self.assertTrue(np.isnan(empty[10][key]))
+
+    def test_streaming_mode_matches_full_rows(self):
+        """Test that streaming mode gives the same summary without keeping rows"""
+        full = run_simulation(iterations=500, N_values=[10, 40], seed=5, workers=1, chunk_size=64)
+        streamed = run_simulation(iterations=500, N_values=[10, 40], seed=5, chunk_size=64, keep_rows=False)
+        
+        for N in [10, 40]:
+            self.assertNotIn('v_true', streamed[N])
+            self.assertNotIn('biases', streamed[N])
+            self.assertEqual(streamed[N]['iterations'], 500)
+            for key in ['avg_bias_v', 'avg_bias_alpha', 'avg_bias_tau', 'avg_squared_error']:
+                self.assertEqual(streamed[N][key], full[N][key])
+            
+            # The running moments agree with a direct mean over the rows
+            np.testing.assert_allclose(full[N]['avg_squared_error'], np.mean(full[N]['squared_errors']))
+            np.testing.assert_allclose(full[N]['avg_bias_v'], np.mean(full[N]['biases'][:, 0]))
+        
+        with tempfile.TemporaryDirectory() as output_dir:
+            save_results(streamed, output_dir)
+            self.assertEqual(os.listdir(output_dir), ['summary.txt'])
+            with open(os.path.join(output_dir, 'summary.txt')) as f:
+                summary = f.read()
+        self.assertIn(f"Average squared error: {full[40]['avg_squared_error']:.6f}", summary)
+
+    def test_binary_results_round_trip(self):
+        """Test the binary writer, the memory-mapped loader and the text export"""
+        results = run_simulation(iterations=30, N_values=[10, 40], seed=2, workers=1)
+        
+        with tempfile.TemporaryDirectory() as text_dir, tempfile.TemporaryDirectory() as binary_dir:
+            save_results(results, text_dir)
+            save_results(results, binary_dir, format='npy')
+            self.assertEqual(sorted(os.listdir(binary_dir)), ['results_N10.npy', 'results_N40.npy', 'summary.txt'])
+            
+            loaded = load_results(binary_dir)
+            self.assertEqual(list(loaded), [10, 40])
+            self.assertEqual(tuple(loaded[40]), RESULT_COLUMNS)
+            
+            columns = loaded[40]
+            self.assertIsInstance(columns['v_true'].base, np.memmap)
+            self.assertTrue(columns['bias_v'].flags['C_CONTIGUOUS'])
+            np.testing.assert_array_equal(columns['v_est'], results[40]['v_est'])
+            np.testing.assert_array_equal(columns['bias_tau'], results[40]['biases'][:, 2])
+            np.testing.assert_array_equal(columns['squared_error'], results[40]['squared_errors'])
+            del loaded, columns
+            
+            # Exporting the binary files reproduces the text writer byte for byte
+            export_text(binary_dir)
+            for N in [10, 40]:
+                with open(os.path.join(text_dir, f'results_N{N}.txt')) as f:
+                    expected = f.read()
+                with open(os.path.join(binary_dir, f'results_N{N}.txt')) as f:
+                    self.assertEqual(f.read(), expected)
+        
+        with self.assertRaises(ValueError):
+            save_results(results, tempfile.gettempdir(), format='csv')
+
+    def test_resume_from_checkpoint(self):
+        """Test that an interrupted checkpointed run resumes to identical results"""
+        kwargs = dict(iterations=100, N_values=[10, 40], chunk_size=15)
+        expected = run_simulation(seed=9, workers=1, **kwargs)
+        
+        original = simulation_main.simulate_chunk
+        calls = []
+        
+        def interrupted(*args):
+            calls.append(args)
+            if len(calls) == 10:
+                raise KeyboardInterrupt
+            return original(*args)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = os.path.join(tmp, 'sweep.ckpt')
+            
+            with mock.patch.object(simulation_main, 'simulate_chunk', interrupted):
+                with self.assertRaises(KeyboardInterrupt):
+                    run_simulation(seed=9, checkpoint=checkpoint, **kwargs)
+            
+            # The checkpoint holds only the moments; each finished chunk's rows have their own file
+            with np.load(checkpoint) as data:
+                self.assertFalse(any(key.startswith('v_true') for key in data.files))
+            self.assertEqual(len(os.listdir(f"{checkpoint}.rows")), 9)
+            
+            # Only the remaining chunks are simulated on resume
+            calls.clear()
+            with mock.patch.object(simulation_main, 'simulate_chunk', interrupted):
+                resumed = run_simulation(seed=9, checkpoint=checkpoint, resume=True, **kwargs)
+            self.assertEqual(len(calls), 14 - 9)
+            
+            for N in [10, 40]:
+                for key in ['v_true', 'tau_est', 'biases', 'squared_errors']:
+                    np.testing.assert_array_equal(resumed[N][key], expected[N][key])
+                for key in ['avg_bias_v', 'avg_bias_alpha', 'avg_bias_tau', 'avg_squared_error']:
+                    self.assertEqual(resumed[N][key], expected[N][key])
+            
+            # Resuming a finished run returns the same results without new work
+            streamed = run_simulation(checkpoint=checkpoint, resume=True, seed=9, **kwargs)
+            self.assertEqual(streamed[40]['avg_squared_error'], expected[40]['avg_squared_error'])
+            
+            # A checkpoint from a different configuration is rejected
+            with self.assertRaises(ValueError):
+                run_simulation(seed=10, checkpoint=checkpoint, resume=True, **kwargs)
+    
+    def test_resume_streaming_run_without_seed(self):
+        """Test that a run without a seed resumes from the entropy in its checkpoint"""
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = os.path.join(tmp, 'sweep.ckpt')
+            first = run_simulation(iterations=50, N_values=[40], chunk_size=20, keep_rows=False,
+                                   checkpoint=checkpoint)
+            again = run_simulation(iterations=50, N_values=[40], chunk_size=20, keep_rows=False,
+                                   checkpoint=checkpoint, resume=True)
+        
+        self.assertEqual(first[40]['avg_squared_error'], again[40]['avg_squared_error'])
+        self.assertEqual(again[40]['iterations'], 50)
+
+    def test_adaptive_stopping(self):
+        """Test that adaptive mode stops each N once its standard errors reach the tolerance"""
+        kwargs = dict(iterations=20000, N_values=[10, 4000], seed=4, chunk_size=500, tolerance=0.005)
+        results = run_simulation(workers=1, **kwargs)
+        
+        # N = 4000 converges quickly, N = 10 needs far more iterations (up to the cap)
+        self.assertLess(results[4000]['iterations'], 2000)
+        self.assertGreater(results[10]['iterations'], 10 * results[4000]['iterations'])
+        self.assertLessEqual(results[10]['iterations'], 20000)
+        for key in ['se_bias_v', 'se_bias_alpha', 'se_bias_tau', 'se_squared_error']:
+            self.assertLessEqual(results[4000][key], 0.005)
+        self.assertEqual(len(results[4000]['v_true']), results[4000]['iterations'])
+        
+        # The stopping point does not depend on the number of workers
+        parallel = run_simulation(workers=3, **kwargs)
+        for N in [10, 4000]:
+            self.assertEqual(parallel[N]['iterations'], results[N]['iterations'])
+            self.assertEqual(parallel[N]['avg_squared_error'], results[N]['avg_squared_error'])
+        
+        # A spent time budget stops after the first chunk
+        budget = run_simulation(iterations=5000, N_values=[40], seed=4, chunk_size=500,
+                                keep_rows=False, time_budget=0)
+        self.assertEqual(budget[40]['iterations'], 500)
+
+    def test_adaptive_resume_between_N_values(self):
+        """Test that an adaptive run interrupted after an N converged resumes to identical results"""
+        kwargs = dict(iterations=20000, N_values=[4000, 10], seed=4, chunk_size=500, tolerance=0.005,
+                      keep_rows=False)
+        expected = run_simulation(**kwargs)
+        
+        original = simulation_main.simulate_chunk
+        
+        def interrupted(N, *args):
+            if N == 10:
+                raise KeyboardInterrupt
+            return original(N, *args)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = os.path.join(tmp, 'sweep.ckpt')
+            with mock.patch.object(simulation_main, 'simulate_chunk', interrupted):
+                with self.assertRaises(KeyboardInterrupt):
+                    run_simulation(checkpoint=checkpoint, **kwargs)
+            
+            # The converged N is already marked as stopped in the checkpoint
+            with np.load(checkpoint) as data:
+                self.assertTrue(data['stopped_4000'])
+            
+            resumed = run_simulation(checkpoint=checkpoint, resume=True, **kwargs)
+        
+        for N in [4000, 10]:
+            self.assertEqual(resumed[N]['iterations'], expected[N]['iterations'])
+            self.assertEqual(resumed[N]['avg_squared_error'], expected[N]['avg_squared_error'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+import src.sweep as sweep
+from src.simulate_and_recover import forward_ez
+from src.sweep import GridDesign, SampledDesign, run_sweep, merge_shards
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.design = GridDesign(v=[0.5, 1.0, 2.0], alpha=[0.8, 1.6], tau=[0.2, 0.4], N=[10, 4000])
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_grid_points(self):
+        """Test that flat point indices map onto the grid with N varying fastest"""
+        v, alpha, tau, N = self.design.points(0, self.design.n_points)
+        self.assertEqual(self.design.n_points, 24)
+        np.testing.assert_array_equal(N[:4], [10, 4000, 10, 4000])
+        np.testing.assert_array_equal(tau[:4], [0.2, 0.2, 0.4, 0.4])
+        self.assertEqual((v[-1], alpha[-1], tau[-1], N[-1]), (2.0, 1.6, 0.4, 4000))
+    
+    def test_sharded_sweep_and_merge(self):
+        """Test that shards merge into design-shaped results independent of the worker count"""
+        serial_dir = os.path.join(self.tmp.name, 'serial')
+        parallel_dir = os.path.join(self.tmp.name, 'parallel')
+        
+        n_shards = run_sweep(self.design, serial_dir, replicates=200, shard_size=1000, seed=3)
+        run_sweep(self.design, parallel_dir, replicates=200, shard_size=1000, workers=2, seed=3)
+        self.assertEqual(n_shards, 5)
+        
+        serial = merge_shards(serial_dir)
+        parallel = merge_shards(parallel_dir)
+        self.assertEqual(serial['mean_bias'].shape, (3, 2, 2, 2, 3))
+        np.testing.assert_array_equal(serial['mean_bias'], parallel['mean_bias'])
+        np.testing.assert_array_equal(serial['mean_squared_error'], parallel['mean_squared_error'])
+        
+        # Recovery error shrinks with N everywhere on the grid
+        mse = serial['mean_squared_error']
+        self.assertTrue(np.all(mse[..., 1] < mse[..., 0]))
+        
+        # A missing shard is recomputed identically when the sweep is run again
+        os.remove(os.path.join(serial_dir, 'shard_00002.npz'))
+        self.assertTrue(np.isnan(merge_shards(serial_dir)['mean_squared_error']).any())
+        run_sweep(self.design, serial_dir, replicates=200, shard_size=1000)
+        np.testing.assert_array_equal(merge_shards(serial_dir)['mean_bias'], serial['mean_bias'])
+        
+        # A different design cannot be written into the same directory
+        with self.assertRaises(ValueError):
+            run_sweep(GridDesign([1.0], [1.0], [0.3], [40]), serial_dir, replicates=200, shard_size=1000)
+    
+    def test_one_prediction_per_triple(self):
+        """Test that each shard predicts every distinct parameter triple once"""
+        predicted = []
+        
+        def counting_forward_ez(v, alpha, tau):
+            predicted.append(len(v))
+            return forward_ez(v, alpha, tau)
+        
+        with mock.patch.object(sweep, 'forward_ez', counting_forward_ez):
+            run_sweep(self.design, os.path.join(self.tmp.name, 'single'), replicates=10, shard_size=240, seed=3)
+            run_sweep(self.design, os.path.join(self.tmp.name, 'split'), replicates=10, shard_size=50, seed=3)
+        
+        # 12 triples with 2 N values each: one shard of 24 points, then shards of 5 points
+        self.assertEqual(predicted[0], 12)
+        self.assertEqual(predicted[1:], [3, 3, 3, 3, 2])
+    
+    def test_sampled_design(self):
+        """Test a sampled design within the requested ranges"""
+        design = SampledDesign.uniform(50, N=[40, 400], ranges={'tau': (0.2, 0.3)}, seed=1)
+        self.assertEqual(design.shape, (50, 2))
+        self.assertTrue(np.all((design.params[:, 2] >= 0.2) & (design.params[:, 2] < 0.3)))
+        
+        output_dir = os.path.join(self.tmp.name, 'sampled')
+        run_sweep(design, output_dir, replicates=20, shard_size=500, seed=1)
+        merged = merge_shards(output_dir)
+        
+        self.assertEqual(merged['mean_squared_error'].shape, (50, 2))
+        np.testing.assert_array_equal(merged['design'].params, design.params)
+        self.assertLess(np.mean(merged['mean_squared_error'][:, 1]), np.mean(merged['mean_squared_error'][:, 0]))
+
+if __name__ == '__main__':
+    unittest.main()
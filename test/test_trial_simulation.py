@@ -0,0 +1,71 @@
+# Acknowledging reference to and help from ChatGPT/AI tools
+
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from src.simulate_and_recover import forward_ez, inverse_ez
+from src.trial_simulation import simulate_trials, summarize_trials, simulate_trial_stats
+
+class TestTrialSimulation(unittest.TestCase):
+    def test_simulate_trials(self):
+        """Test the shape and basic properties of simulated trials"""
+        correct, rt = simulate_trials([1.0, 2.0], [1.0, 1.5], [0.3, 0.2], 500, rng=0)
+        
+        self.assertEqual(correct.shape, (2, 500))
+        self.assertEqual(rt.shape, (2, 500))
+        self.assertEqual(correct.dtype, bool)
+        self.assertTrue(np.all(rt[0] > 0.3))
+        self.assertTrue(np.all(rt[1] > 0.2))
+        
+        # Trials that cannot finish within max_time are left without a response
+        _, slow = simulate_trials(0.0, 20.0, 0.3, 10, max_time=0.05, rng=0)
+        self.assertTrue(np.all(np.isnan(slow)))
+    
+    def test_summary_matches_forward_ez(self):
+        """Test that trial-level summary statistics agree with the EZ predictions"""
+        v = np.array([0.5, 1.0, 2.0])
+        alpha = np.array([0.5, 1.0, 2.0])
+        tau = np.array([0.1, 0.3, 0.4])
+        
+        R_obs, M_obs, V_obs, n = simulate_trial_stats(v, alpha, tau, 40000, rng=1)
+        R_pred, M_pred, V_pred = forward_ez(v, alpha, tau)
+        
+        np.testing.assert_array_equal(n, 40000)
+        np.testing.assert_allclose(R_obs, R_pred, atol=0.01)
+        np.testing.assert_allclose(M_obs, M_pred, atol=0.01)
+        np.testing.assert_allclose(V_obs, V_pred, rtol=0.05)
+        
+        # The summary statistics plug straight into inverse_ez
+        v_est, alpha_est, tau_est = inverse_ez(R_obs, M_obs, V_obs)
+        np.testing.assert_allclose(v_est, v, rtol=0.15)
+        np.testing.assert_allclose(alpha_est, alpha, rtol=0.15)
+        np.testing.assert_allclose(tau_est, tau, atol=0.02)
+    
+    def test_chunked_stats_match_full_arrays(self):
+        """Test that chunked accumulation gives the same statistics as the full trial arrays"""
+        v, alpha, tau = [0.8, 1.5], [1.2, 0.7], [0.2, 0.3]
+        
+        correct, rt = simulate_trials(v, alpha, tau, 300, rng=3)
+        R_obs, M_obs, V_obs, n = summarize_trials(correct, rt)
+        
+        hits = rt[0][correct[0]]
+        self.assertAlmostEqual(R_obs[0], np.mean(correct[0]))
+        self.assertAlmostEqual(M_obs[0], np.mean(hits))
+        self.assertAlmostEqual(V_obs[0], np.var(hits, ddof=1))
+        
+        # One chunk per parameter set and trial block reproduces the same draws when unchunked
+        full = simulate_trial_stats(v, alpha, tau, 300, chunk_size=600, rng=3)
+        for expected, actual in zip((R_obs, M_obs, V_obs, n), full):
+            np.testing.assert_allclose(actual, expected)
+        
+        # Smaller chunks use different draws but the same distribution
+        chunked = simulate_trial_stats(v, alpha, tau, 20000, chunk_size=1000, rng=4)
+        np.testing.assert_allclose(chunked[0], forward_ez(v, alpha, tau)[0], atol=0.02)
+
+if __name__ == '__main__':
+    unittest.main()